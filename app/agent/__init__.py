@@ -1,6 +1,11 @@
 """Agent module."""
 
-from app.agent.prompts import SYSTEM_PROMPT, get_system_prompt_with_context
+from app.agent.prompts import (
+    SYSTEM_PROMPT,
+    get_context_prompt,
+    get_system_blocks,
+    get_system_prompt_with_context,
+)
 from app.agent.react_agent import ReActAgent
 from app.agent.types import (
     AgentResponse,
@@ -18,5 +23,7 @@ __all__ = [
     "SYSTEM_PROMPT",
     "ToolCallRequest",
     "ToolResult",
+    "get_context_prompt",
+    "get_system_blocks",
     "get_system_prompt_with_context",
 ]
\ No newline at end of file
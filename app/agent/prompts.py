@@ -1,5 +1,7 @@
 """System prompts for the agent."""
 
+from typing import Any
+
 SYSTEM_PROMPT = """You are SkyPlanner, an intelligent assistant specialized in helping users plan their schedules considering weather conditions, events, and personal preferences.
 
 ## Your Capabilities
@@ -76,6 +78,24 @@ When presenting calendar events to users, format each event based on its type:
 - 설명: [설명 내용 요약]
 """
 
+
+def get_context_prompt(today: str) -> str:
+    """Get the dynamic date context appended to the system prompt.
+
+    Args:
+        today: Today's date in YYYY-MM-DD format.
+
+    Returns:
+        Date context section.
+    """
+    year = today.split("-")[0]
+    return f"""## Current Context
+
+Today's date: {today}
+
+**IMPORTANT**: When the user mentions a date without specifying the year (e.g., "12월 14일"), ALWAYS use the current year ({year}). Do not assume a past year."""
+
+
 def get_system_prompt_with_context(today: str) -> str:
     """Get system prompt with current date context.
 
@@ -85,11 +105,29 @@ def get_system_prompt_with_context(today: str) -> str:
     Returns:
         System prompt with date context.
     """
-    year = today.split("-")[0]
-    return f"""{SYSTEM_PROMPT}
+    return f"{SYSTEM_PROMPT}\n\n{get_context_prompt(today)}"
 
-## Current Context
 
-Today's date: {today}
+def get_system_blocks(today: str) -> list[dict[str, Any]]:
+    """Get system prompt as content blocks for prompt caching.
+
+    The static SYSTEM_PROMPT is marked cacheable so Anthropic can reuse the
+    prefix across requests; the date context changes daily and stays uncached.
 
-**IMPORTANT**: When the user mentions a date without specifying the year (e.g., "12월 14일"), ALWAYS use the current year ({year}). Do not assume a past year."""
\ No newline at end of file
+    Args:
+        today: Today's date in YYYY-MM-DD format.
+
+    Returns:
+        System content blocks in Claude API format.
+    """
+    return [
+        {
+            "type": "text",
+            "text": SYSTEM_PROMPT,
+            "cache_control": {"type": "ephemeral"},
+        },
+        {
+            "type": "text",
+            "text": get_context_prompt(today),
+        },
+    ]
@@ -1,13 +1,16 @@
 """ReAct agent implementation."""
 
+import asyncio
 import json
+from collections import OrderedDict
 from collections.abc import AsyncGenerator
 from datetime import date
 from typing import Any
 
-import anthropic
+import orjson
+from anthropic import AsyncAnthropic
 
-from app.agent.prompts import get_system_prompt_with_context
+from app.agent.prompts import get_system_blocks
 from app.agent.types import (
     AgentResponse,
     AgentState,
@@ -18,6 +21,93 @@ from app.agent.types import (
 from app.config import settings
 from app.tools import registry
 
+# Shared client so HTTP connections are pooled across agents and requests
+_client = AsyncAnthropic(api_key=settings.anthropic_api_key, max_retries=2)
+
+# Streamed text is coalesced until either threshold is reached
+_TEXT_FLUSH_CHARS = 32
+_TEXT_FLUSH_INTERVAL = 0.02
+
+# Maximum number of responses kept by the run() response cache
+_RESPONSE_CACHE_SIZE = 1024
+
+# Response cache key: (today, model, ((role, content), ...))
+_CacheKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+def _with_cache_breakpoint(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Mark the last content block of the conversation as a cache breakpoint.
+
+    Only the final message is copied, so the caller's history is left
+    untouched and a single breakpoint moves forward as the loop progresses.
+
+    Args:
+        messages: Conversation messages.
+
+    Returns:
+        Messages with ``cache_control`` on the last content block.
+    """
+    if not messages or not messages[-1]["content"]:
+        return messages
+
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        blocks = [_text_block(content)]
+    else:
+        blocks = list(content)
+    blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+    return [*messages[:-1], {**last, "content": blocks}]
+
+
+def _text_block(text: str) -> dict[str, Any]:
+    """Build a text content block."""
+    return {"type": "text", "text": text}
+
+
+def _tool_use_block(tool_call: ToolCallRequest) -> dict[str, Any]:
+    """Build a tool_use content block."""
+    return {
+        "type": "tool_use",
+        "id": tool_call.id,
+        "name": tool_call.name,
+        "input": tool_call.input,
+    }
+
+
+def _tool_result_block(result: ToolResult) -> dict[str, Any]:
+    """Build a tool_result content block."""
+    return {
+        "type": "tool_result",
+        "tool_use_id": result.tool_use_id,
+        "content": result.content,
+        "is_error": result.is_error,
+    }
+
+
+def _cacheable_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Mark the last tool definition as a cache breakpoint.
+
+    Args:
+        tools: Tool definitions in Claude API format.
+
+    Returns:
+        Tool definitions with ``cache_control`` on the last tool.
+    """
+    if not tools:
+        return tools
+    return [*tools[:-1], {**tools[-1], "cache_control": {"type": "ephemeral"}}]
+
+
+def _count_tokens(usage: Any) -> int:
+    """Count input, output, and prompt cache tokens of a response."""
+    return (
+        usage.input_tokens
+        + usage.output_tokens
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0)
+    )
+
 
 class ReActAgent:
     """ReAct agent using Claude API."""
@@ -26,16 +116,21 @@ class ReActAgent:
         self,
         max_iterations: int = 10,
         model: str | None = None,
+        max_parallel_tools: int = 4,
     ) -> None:
         """Initialize the agent.
 
         Args:
             max_iterations: Maximum tool use iterations.
             model: Model to use (defaults to settings).
+            max_parallel_tools: Maximum tools executed concurrently in a turn.
         """
         self.max_iterations = max_iterations
+        self.max_parallel_tools = max_parallel_tools
         self.model = model or settings.anthropic_model
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+        self.client = _client
+        self._tools = _cacheable_tools(registry.to_claude_tools())
+        self._response_cache: OrderedDict[_CacheKey, AgentResponse] = OrderedDict()
 
     async def run(
         self,
@@ -49,8 +144,13 @@ class ReActAgent:
         Returns:
             Agent response.
         """
-        system_prompt = get_system_prompt_with_context(date.today().isoformat())
-        tools = registry.to_claude_tools()
+        today = date.today().isoformat()
+        cache_key = self._cache_key(today, messages)
+        if cache_key is not None and cache_key in self._response_cache:
+            self._response_cache.move_to_end(cache_key)
+            return self._response_cache[cache_key].model_copy(deep=True)
+
+        system_blocks = get_system_blocks(today)
 
         all_tool_calls: list[ToolCallRequest] = []
         all_tool_results: list[ToolResult] = []
@@ -59,26 +159,24 @@ class ReActAgent:
         current_messages = list(messages)
 
         for _ in range(self.max_iterations):
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=4096,
-                system=system_prompt,
-                tools=tools,
-                messages=current_messages,
+                system=system_blocks,
+                tools=self._tools,
+                messages=_with_cache_breakpoint(current_messages),
             )
 
-            total_tokens += response.usage.input_tokens + response.usage.output_tokens
+            total_tokens += _count_tokens(response.usage)
 
             # Check stop reason
             if response.stop_reason == "end_turn":
-                # Extract text content
-                content = ""
-                for block in response.content:
-                    if block.type == "text":
-                        content = block.text
-                        break
+                # Extract text content from every text block
+                content = "".join(
+                    block.text for block in response.content if block.type == "text"
+                )
 
-                return AgentResponse(
+                agent_response = AgentResponse(
                     content=content,
                     tool_calls=all_tool_calls,
                     tool_results=all_tool_results,
@@ -86,17 +184,22 @@ class ReActAgent:
                     tokens_used=total_tokens,
                 )
 
+                # Tool results depend on live data, so only cache plain answers
+                if cache_key is not None and not all_tool_calls:
+                    self._response_cache[cache_key] = agent_response.model_copy(deep=True)
+                    if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                        self._response_cache.popitem(last=False)
+
+                return agent_response
+
             elif response.stop_reason == "tool_use":
                 # Process tool calls
-                assistant_content = []
+                assistant_content: list[dict[str, Any]] = []
                 tool_calls_in_turn: list[ToolCallRequest] = []
 
                 for block in response.content:
                     if block.type == "text":
-                        assistant_content.append({
-                            "type": "text",
-                            "text": block.text,
-                        })
+                        assistant_content.append(_text_block(block.text))
                     elif block.type == "tool_use":
                         tool_call = ToolCallRequest(
                             id=block.id,
@@ -105,12 +208,7 @@ class ReActAgent:
                         )
                         tool_calls_in_turn.append(tool_call)
                         all_tool_calls.append(tool_call)
-                        assistant_content.append({
-                            "type": "tool_use",
-                            "id": block.id,
-                            "name": block.name,
-                            "input": block.input,
-                        })
+                        assistant_content.append(_tool_use_block(tool_call))
 
                 # Add assistant message
                 current_messages.append({
@@ -118,17 +216,10 @@ class ReActAgent:
                     "content": assistant_content,
                 })
 
-                # Execute tools and collect results
-                tool_results_content = []
-                for tool_call in tool_calls_in_turn:
-                    result = await self._execute_tool(tool_call)
-                    all_tool_results.append(result)
-                    tool_results_content.append({
-                        "type": "tool_result",
-                        "tool_use_id": result.tool_use_id,
-                        "content": result.content,
-                        "is_error": result.is_error,
-                    })
+                # Execute tools concurrently and collect results in order
+                results = await self._execute_tools(tool_calls_in_turn)
+                all_tool_results.extend(results)
+                tool_results_content = [_tool_result_block(result) for result in results]
 
                 # Add tool results
                 current_messages.append({
@@ -157,10 +248,10 @@ class ReActAgent:
         Yields:
             Stream events.
         """
-        system_prompt = get_system_prompt_with_context(date.today().isoformat())
-        tools = registry.to_claude_tools()
+        system_blocks = get_system_blocks(date.today().isoformat())
 
         current_messages = list(messages)
+        loop = asyncio.get_running_loop()
 
         for iteration in range(self.max_iterations):
             yield StreamEvent(
@@ -171,51 +262,74 @@ class ReActAgent:
             # Stream response
             tool_calls_in_turn: list[ToolCallRequest] = []
             assistant_content: list[dict] = []
-            current_text = ""
+            current_text_parts: list[str] = []
+            pending_text_parts: list[str] = []
+            pending_length = 0
+            last_flush = loop.time()
             current_tool_use: dict | None = None
+            tool_input_parts: list[str] = []
 
-            with self.client.messages.stream(
+            async with self.client.messages.stream(
                 model=self.model,
                 max_tokens=4096,
-                system=system_prompt,
-                tools=tools,
-                messages=current_messages,
+                system=system_blocks,
+                tools=self._tools,
+                messages=_with_cache_breakpoint(current_messages),
             ) as stream:
-                for event in stream:
+                async for event in stream:
                     if event.type == "content_block_start":
                         if event.content_block.type == "text":
-                            current_text = ""
+                            current_text_parts.clear()
                         elif event.content_block.type == "tool_use":
                             current_tool_use = {
                                 "id": event.content_block.id,
                                 "name": event.content_block.name,
-                                "input": "",
                             }
+                            tool_input_parts.clear()
 
                     elif event.type == "content_block_delta":
                         if event.delta.type == "text_delta":
-                            current_text += event.delta.text
-                            yield StreamEvent(
-                                event_type="text_delta",
-                                content=event.delta.text,
-                                state=AgentState.RESPONDING,
-                            )
+                            current_text_parts.append(event.delta.text)
+                            pending_text_parts.append(event.delta.text)
+                            pending_length += len(event.delta.text)
+                            now = loop.time()
+                            if (
+                                pending_length >= _TEXT_FLUSH_CHARS
+                                or now - last_flush >= _TEXT_FLUSH_INTERVAL
+                            ):
+                                yield StreamEvent(
+                                    event_type="text_delta",
+                                    content="".join(pending_text_parts),
+                                    state=AgentState.RESPONDING,
+                                )
+                                pending_text_parts.clear()
+                                pending_length = 0
+                                last_flush = now
                         elif event.delta.type == "input_json_delta":
                             if current_tool_use:
-                                current_tool_use["input"] += event.delta.partial_json
+                                tool_input_parts.append(event.delta.partial_json)
 
                     elif event.type == "content_block_stop":
-                        if current_text:
-                            assistant_content.append({
-                                "type": "text",
-                                "text": current_text,
-                            })
-                            current_text = ""
+                        if pending_text_parts:
+                            yield StreamEvent(
+                                event_type="text_delta",
+                                content="".join(pending_text_parts),
+                                state=AgentState.RESPONDING,
+                            )
+                            pending_text_parts.clear()
+                            pending_length = 0
+                            last_flush = loop.time()
+
+                        text = "".join(current_text_parts)
+                        current_text_parts.clear()
+                        if text:
+                            assistant_content.append(_text_block(text))
                         elif current_tool_use:
                             try:
-                                input_data = json.loads(current_tool_use["input"])
+                                input_data = json.loads("".join(tool_input_parts))
                             except json.JSONDecodeError:
                                 input_data = {}
+                            tool_input_parts.clear()
 
                             tool_call = ToolCallRequest(
                                 id=current_tool_use["id"],
@@ -223,12 +337,7 @@ class ReActAgent:
                                 input=input_data,
                             )
                             tool_calls_in_turn.append(tool_call)
-                            assistant_content.append({
-                                "type": "tool_use",
-                                "id": tool_call.id,
-                                "name": tool_call.name,
-                                "input": tool_call.input,
-                            })
+                            assistant_content.append(_tool_use_block(tool_call))
 
                             yield StreamEvent(
                                 event_type="tool_use",
@@ -237,7 +346,7 @@ class ReActAgent:
                             )
                             current_tool_use = None
 
-                response = stream.get_final_message()
+                response = await stream.get_final_message()
 
             # Check if we're done
             if response.stop_reason == "end_turn":
@@ -254,16 +363,10 @@ class ReActAgent:
                     "content": assistant_content,
                 })
 
+                results = await self._execute_tools(tool_calls_in_turn)
                 tool_results_content = []
-                for tool_call in tool_calls_in_turn:
-                    result = await self._execute_tool(tool_call)
-                    tool_results_content.append({
-                        "type": "tool_result",
-                        "tool_use_id": result.tool_use_id,
-                        "content": result.content,
-                        "is_error": result.is_error,
-                    })
-
+                for result in results:
+                    tool_results_content.append(_tool_result_block(result))
                     yield StreamEvent(
                         event_type="tool_result",
                         tool_result=result,
@@ -282,6 +385,47 @@ class ReActAgent:
             state=AgentState.ERROR,
         )
 
+    def _cache_key(
+        self,
+        today: str,
+        messages: list[dict[str, Any]],
+    ) -> _CacheKey | None:
+        """Build the response cache key for a conversation.
+
+        Args:
+            today: Today's date, part of the system prompt.
+            messages: Conversation messages.
+
+        Returns:
+            Hashable key, or None if the conversation holds content blocks.
+        """
+        key: list[tuple[str, str]] = []
+        for message in messages:
+            if not isinstance(message["content"], str):
+                return None
+            key.append((message["role"], message["content"]))
+        return (today, self.model, tuple(key))
+
+    async def _execute_tools(
+        self,
+        tool_calls: list[ToolCallRequest],
+    ) -> list[ToolResult]:
+        """Execute the tool calls of a turn concurrently.
+
+        Args:
+            tool_calls: Tool call requests emitted in a single turn.
+
+        Returns:
+            Tool execution results in the same order as the requests.
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+
+        async def execute(tool_call: ToolCallRequest) -> ToolResult:
+            async with semaphore:
+                return await self._execute_tool(tool_call)
+
+        return list(await asyncio.gather(*(execute(tc) for tc in tool_calls)))
+
     async def _execute_tool(self, tool_call: ToolCallRequest) -> ToolResult:
         """Execute a tool call.
 
@@ -295,12 +439,15 @@ class ReActAgent:
             result = await registry.execute(tool_call.name, **tool_call.input)
             return ToolResult(
                 tool_use_id=tool_call.id,
-                content=json.dumps(result, ensure_ascii=False),
+                content=orjson.dumps(result).decode(),
                 is_error=not result.get("success", True),
+                raw_result=result,
             )
         except Exception as e:
+            error = {"error": str(e)}
             return ToolResult(
                 tool_use_id=tool_call.id,
-                content=json.dumps({"error": str(e)}),
+                content=orjson.dumps(error).decode(),
                 is_error=True,
+                raw_result=error,
             )
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Agent type definitions."""
 
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
@@ -17,7 +18,8 @@ class AgentState(str, Enum):
     ERROR = "error"
 
 
-class ToolCallRequest(BaseModel):
+@dataclass(slots=True)
+class ToolCallRequest:
     """Tool call request from Claude."""
 
     id: str
@@ -25,12 +27,14 @@ class ToolCallRequest(BaseModel):
     input: dict[str, Any]
 
 
-class ToolResult(BaseModel):
+@dataclass(slots=True)
+class ToolResult:
     """Tool execution result."""
 
     tool_use_id: str
     content: str
     is_error: bool = False
+    raw_result: dict[str, Any] | None = None
 
 
 class AgentResponse(BaseModel):
@@ -43,8 +47,13 @@ class AgentResponse(BaseModel):
     tokens_used: int = 0
 
 
-class StreamEvent(BaseModel):
-    """Streaming event model."""
+@dataclass(slots=True)
+class StreamEvent:
+    """Streaming event model.
+
+    Internal, trusted data emitted per streamed chunk, so it skips
+    pydantic validation.
+    """
 
     event_type: str  # text_delta, tool_use, tool_result, done, error
     content: str = ""
@@ -1,11 +1,25 @@
 """FastAPI application."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.routes import router
 from app.config import settings
+from app.db import create_messages_table, create_sessions_table
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create DynamoDB tables once before serving requests."""
+    create_sessions_table()
+    create_messages_table()
+    yield
+
 
 app = FastAPI(
     title="SkyPlanner API",
@@ -13,6 +27,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -24,6 +39,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON responses such as session lists and histories
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Include routes
 app.include_router(router)
 
@@ -1,13 +1,14 @@
 """API routes."""
 
 import asyncio
-import json
 import logging
+from collections.abc import AsyncGenerator, AsyncIterator
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
-from app.agent import ReActAgent
+from app.agent import ReActAgent, StreamEvent
 from app.api.schemas import (
     ChatRequest,
     ErrorResponse,
@@ -21,16 +22,33 @@ from app.api.schemas import (
     ToolParameterResponse,
     ToolResponse,
 )
+from app.config import settings
 from app.session import Message, SessionManager, generate_title, regenerate_title_from_conversation
 from app.tools import registry
 
 router = APIRouter(prefix="/api", tags=["api"])
 
-# Initialize session manager
+# Initialize session manager and agent once so cached prompt/tool blocks are
+# shared across requests
 session_manager = SessionManager()
+agent = ReActAgent()
 
 logger = logging.getLogger(__name__)
 
+# Message roles that make up the visible conversation
+_CHAT_ROLES = frozenset({"user", "assistant"})
+
+# Pre-encoded SSE frame parts
+_SSE_TITLE = b"event: title\ndata: "
+_SSE_TEXT = b'event: text\ndata: {"content": '
+_SSE_TEXT_END = b"}\n\n"
+_SSE_TOOL_USE = b"event: tool_use\ndata: "
+_SSE_TOOL_RESULT = b"event: tool_result\ndata: "
+_SSE_ERROR = b"event: error\ndata: "
+_SSE_PING = b"event: ping\ndata: {}\n\n"
+_SSE_END = b"\n\n"
+_SSE_DONE = b"event: done\ndata: " + orjson.dumps({"status": "completed"}) + _SSE_END
+
 
 # Session endpoints
 @router.post(
@@ -41,14 +59,14 @@ logger = logging.getLogger(__name__)
 async def create_session(request: SessionCreate) -> SessionResponse:
     """Create a new session."""
     try:
-        session = session_manager.create_session(title=request.title)
+        session = await asyncio.to_thread(session_manager.create_session, title=request.title)
         logger.info(f"created session: {session.id}")
         return SessionResponse(
             id=session.id,
             title=session.title,
             created_at=session.created_at,
             updated_at=session.updated_at,
-            message_count=len(session.messages),
+            message_count=session.message_count,
             total_tokens=session.total_tokens,
         )
     except Exception as e:
@@ -63,15 +81,16 @@ async def create_session(request: SessionCreate) -> SessionResponse:
 async def list_sessions(limit: int = 50) -> SessionListResponse:
     """List all sessions."""
     try:
-        sessions = session_manager.list_sessions(limit=limit)
+        sessions = await asyncio.to_thread(session_manager.list_sessions, limit=limit)
         return SessionListResponse(
             sessions=[
-                SessionResponse(
+                # Fields come from already validated sessions
+                SessionResponse.model_construct(
                     id=s.id,
                     title=s.title,
                     created_at=s.created_at,
                     updated_at=s.updated_at,
-                    message_count=len(s.messages),
+                    message_count=s.message_count,
                     total_tokens=s.total_tokens,
                 )
                 for s in sessions
@@ -89,7 +108,7 @@ async def list_sessions(limit: int = 50) -> SessionListResponse:
 )
 async def get_session(session_id: str) -> SessionDetailResponse:
     """Get session details."""
-    session = session_manager.get_session(session_id)
+    session = await asyncio.to_thread(session_manager.get_session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -125,11 +144,11 @@ async def get_session(session_id: str) -> SessionDetailResponse:
 )
 async def delete_session(session_id: str) -> dict:
     """Delete a session."""
-    session = session_manager.get_session(session_id)
+    session = await asyncio.to_thread(session_manager.get_session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    if not session_manager.delete_session(session_id):
+    if not await asyncio.to_thread(session_manager.delete_session, session_id):
         raise HTTPException(status_code=500, detail="Failed to delete session")
 
     return {"message": "Session deleted"}
@@ -141,7 +160,7 @@ async def delete_session(session_id: str) -> dict:
 )
 async def regenerate_session_title(session_id: str) -> dict:
     """Regenerate session title from conversation history."""
-    session = session_manager.get_session(session_id)
+    session = await asyncio.to_thread(session_manager.get_session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -149,7 +168,7 @@ async def regenerate_session_title(session_id: str) -> dict:
     messages = [
         {"role": m.role, "content": m.content}
         for m in session.messages
-        if m.role in ("user", "assistant")
+        if m.role in _CHAT_ROLES
     ]
 
     if not messages:
@@ -158,7 +177,7 @@ async def regenerate_session_title(session_id: str) -> dict:
     try:
         # Generate new title from full conversation
         new_title = await regenerate_title_from_conversation(messages)
-        session_manager.update_title(session_id, new_title)
+        await asyncio.to_thread(session_manager.update_title, session_id, new_title)
         logger.info(f"Regenerated title for session {session_id}: {new_title}")
         return {"title": new_title}
     except Exception as e:
@@ -166,6 +185,74 @@ async def regenerate_session_title(session_id: str) -> dict:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _generate_session_title(session_id: str, message: str) -> str | None:
+    """Generate and save a title for a session from its first message.
+
+    Titles are a side job of the chat, so failures are logged rather than
+    raised into the reply stream.
+
+    Returns:
+        The new title, or None if it could not be generated or saved.
+    """
+    try:
+        title = await generate_title(message)
+        await asyncio.to_thread(session_manager.update_title, session_id, title)
+        return title
+    except Exception as e:
+        logger.error(f"Failed to generate title for session {session_id}: {e}")
+        return None
+
+
+async def _with_heartbeat(
+    events: AsyncIterator[StreamEvent],
+    interval: float,
+) -> AsyncGenerator[StreamEvent | None, None]:
+    """Relay stream events, yielding None whenever the stream is idle.
+
+    The source is drained by a single background task, so only the wait on
+    the queue is ever timed out and the stream itself is never cancelled
+    mid-step.
+
+    Args:
+        events: Agent stream events.
+        interval: Seconds without an event before a heartbeat is yielded.
+
+    Yields:
+        Stream events, or None as a heartbeat.
+    """
+    queue: asyncio.Queue[StreamEvent | BaseException | None] = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=interval)
+            except TimeoutError:
+                yield None
+                continue
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+
+def _title_frame(title: str) -> bytes:
+    """Build the SSE frame announcing a session title."""
+    return _SSE_TITLE + orjson.dumps({"title": title}) + _SSE_END
+
+
 # Chat endpoint
 @router.post(
     "/sessions/{session_id}/chat",
@@ -173,28 +260,36 @@ async def regenerate_session_title(session_id: str) -> dict:
 )
 async def chat(session_id: str, request: ChatRequest) -> StreamingResponse:
     """Chat with the agent (SSE streaming)."""
-    session = session_manager.get_session(session_id)
+    session = await asyncio.to_thread(session_manager.get_session, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     async def event_generator():
+        pending_messages: list[Message] = []
         try:
-            # Add user message
+            # Save the user message right away so it survives a dropped
+            # stream; the agent's messages are saved together at the end
             user_message = Message(role="user", content=request.message)
-            session_manager.add_message(session_id, user_message)
-
-            # Generate title for first message
-            if len(session.messages) == 0:
-                title = await generate_title(request.message)
-                session_manager.update_title(session_id, title)
-                yield f"event: title\ndata: {json.dumps({'title': title}, ensure_ascii=False)}\n\n"
+            is_first_message = not session.messages
+            if not await asyncio.to_thread(
+                session_manager.add_message, session_id, user_message
+            ):
+                logger.error(f"Failed to save user message for session {session_id}")
+
+            # Generate title for first message alongside the agent stream
+            title_task = None
+            if is_first_message:
+                title_task = asyncio.create_task(
+                    _generate_session_title(session_id, request.message)
+                )
 
             # Get conversation history with tool results (for context reuse)
-            current_session = session_manager.get_session(session_id)
-            messages = current_session.get_messages_for_api()
+            session.add_message(user_message)
+            messages = session.get_messages_for_api(
+                max_messages=settings.max_history_messages
+            )
 
             # Run agent
-            agent = ReActAgent()
             full_response = ""
             after_tool_use = False  # Track if we just finished tool execution
             
@@ -202,7 +297,19 @@ async def chat(session_id: str, request: ChatRequest) -> StreamingResponse:
             collected_tool_calls = []
             collected_tool_results = {}
 
-            async for event in agent.run_stream(messages):
+            async for event in _with_heartbeat(
+                agent.run_stream(messages), settings.sse_heartbeat_interval
+            ):
+                if title_task is not None and title_task.done():
+                    if title := title_task.result():
+                        yield _title_frame(title)
+                    title_task = None
+
+                # keep the client informed while waiting for the model or tools
+                if event is None:
+                    yield _SSE_PING
+                    continue
+
                 # claude streaming answer (chunk)
                 if event.event_type == "text_delta":
                     content = event.content
@@ -211,7 +318,7 @@ async def chat(session_id: str, request: ChatRequest) -> StreamingResponse:
                         content = "\n\n" + content
                         after_tool_use = False
                     full_response += content
-                    yield f"event: text\ndata: {json.dumps({'content': content}, ensure_ascii=False)}\n\n"
+                    yield _SSE_TEXT + orjson.dumps(content) + _SSE_TEXT_END
 
                 # call tool
                 elif event.event_type == "tool_use":
@@ -221,14 +328,29 @@ async def chat(session_id: str, request: ChatRequest) -> StreamingResponse:
                         "name": event.tool_call.name,
                         "input": event.tool_call.input,
                     })
-                    yield f"event: tool_use\ndata: {json.dumps({'name': event.tool_call.name, 'input': event.tool_call.input}, ensure_ascii=False)}\n\n"
+                    yield (
+                        _SSE_TOOL_USE
+                        + orjson.dumps({
+                            "id": event.tool_call.id,
+                            "name": event.tool_call.name,
+                            "input": event.tool_call.input,
+                        })
+                        + _SSE_END
+                    )
 
                 # tool result
                 elif event.event_type == "tool_result":
-                    result_data = json.loads(event.tool_result.content)
+                    result_data = event.tool_result.raw_result
                     # Collect tool result
                     collected_tool_results[event.tool_result.tool_use_id] = result_data
-                    yield f"event: tool_result\ndata: {json.dumps({'tool_use_id': event.tool_result.tool_use_id, 'result': result_data}, ensure_ascii=False)}\n\n"
+                    yield (
+                        _SSE_TOOL_RESULT
+                        + orjson.dumps({
+                            "tool_use_id": event.tool_result.tool_use_id,
+                            "result": result_data,
+                        })
+                        + _SSE_END
+                    )
                     after_tool_use = True  # Mark that next text follows tool execution
 
                 elif event.event_type == "done":
@@ -250,19 +372,28 @@ async def chat(session_id: str, request: ChatRequest) -> StreamingResponse:
                         content=full_response,
                         tool_calls=tool_calls_to_save,
                     )
-                    session_manager.add_message(session_id, assistant_message)
+                    pending_messages.append(assistant_message)
 
-                    yield f"event: done\ndata: {json.dumps({'status': 'completed'}, ensure_ascii=False)}\n\n"
+                    yield _SSE_DONE
 
                 elif event.event_type == "error":
-                    yield f"event: error\ndata: {json.dumps({'error': event.content}, ensure_ascii=False)}\n\n"
+                    yield _SSE_ERROR + orjson.dumps({"error": event.content}) + _SSE_END
 
-                # Small delay for streaming
-                # 버퍼에 쌓이지 않도록 플러시 보장
-                await asyncio.sleep(0.01)
+            if title_task is not None and (title := await title_task):
+                yield _title_frame(title)
 
         except Exception as e:
-            yield f"event: error\ndata: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
+            yield _SSE_ERROR + orjson.dumps({"error": str(e)}) + _SSE_END
+
+        finally:
+            try:
+                saved = await asyncio.to_thread(
+                    session_manager.add_messages, session_id, pending_messages
+                )
+                if not saved:
+                    logger.error(f"Failed to save messages for session {session_id}")
+            except Exception as e:
+                logger.error(f"Failed to save messages for session {session_id}: {e}")
 
     return StreamingResponse(
         event_generator(),
@@ -271,6 +402,8 @@ async def chat(session_id: str, request: ChatRequest) -> StreamingResponse:
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
+            # Keeps GZipMiddleware from buffering the event stream
+            "Content-Encoding": "identity",
         },
     )
 
@@ -1,6 +1,6 @@
 """Application settings using pydantic-settings."""
 
-from functools import lru_cache
+from functools import cache
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     # Anthropic API
     anthropic_api_key: str = ""
     anthropic_model: str = "claude-sonnet-4-20250514"
+    max_history_messages: int = 20
 
     # Google Calendar API
     google_client_id: str = ""
@@ -31,16 +32,18 @@ class Settings(BaseSettings):
     # DynamoDB
     dynamodb_endpoint_url: str = "http://localhost:8000"
     dynamodb_table_name: str = "skyplanner_sessions"
+    dynamodb_messages_table_name: str = "skyplanner_messages"
     aws_region: str = "ap-northeast-2"
     aws_access_key_id: str = "local"
     aws_secret_access_key: str = "local"
 
     # Application
+    sse_heartbeat_interval: float = 0.5
     debug: bool = False
     log_level: str = "INFO"
 
 
-@lru_cache
+@cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
@@ -1,17 +1,27 @@
 """Database module."""
 
 from app.db.dynamodb import (
+    UPDATED_AT_INDEX,
+    UPDATED_AT_INDEX_PARTITION,
+    create_messages_table,
     create_sessions_table,
     get_dynamodb_client,
     get_dynamodb_resource,
+    get_messages_table,
     get_table,
     test_connection,
+    updated_at_index_ready,
 )
 
 __all__ = [
+    "UPDATED_AT_INDEX",
+    "UPDATED_AT_INDEX_PARTITION",
+    "create_messages_table",
     "create_sessions_table",
     "get_dynamodb_client",
     "get_dynamodb_resource",
+    "get_messages_table",
     "get_table",
     "test_connection",
+    "updated_at_index_ready",
 ]
\ No newline at end of file
@@ -1,42 +1,143 @@
-"""DynamoDB client and table management."""
+"""DynamoDB client and table management.
+
+Clients, resources and tables are process-wide singletons. They are built on
+first use and shared by every request, so create them at startup rather than
+per request handler.
+"""
+
+from functools import cache
+from typing import Any
 
 import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from app.config import settings
 
+# Keep connections warm and pooled; retry throttling adaptively
+DEFAULT_CONFIG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    connect_timeout=1,
+    read_timeout=3,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+)
+
+# Global secondary index listing sessions by recency. Every session shares
+# one constant partition key so a single Query returns them sorted.
+UPDATED_AT_INDEX = "ByUpdatedAt"
+UPDATED_AT_INDEX_PARTITION = "SESSION"
+_UPDATED_AT_INDEX_ATTRIBUTES = [
+    {"AttributeName": "gsi_pk", "AttributeType": "S"},
+    {"AttributeName": "updated_at", "AttributeType": "S"},
+]
+_UPDATED_AT_INDEX_SPEC = {
+    "IndexName": UPDATED_AT_INDEX,
+    "KeySchema": [
+        {"AttributeName": "gsi_pk", "KeyType": "HASH"},
+        {"AttributeName": "updated_at", "KeyType": "RANGE"},
+    ],
+    "Projection": {"ProjectionType": "ALL"},
+}
+
+# Table tag recording that every session item carries the index key, so
+# the backfill scan runs once per table rather than once per startup
+_BACKFILLED_TAG = {"Key": "updated_at_index_backfilled", "Value": "true"}
+
+# Set once the index is known to list every session; it never goes back
+_updated_at_index_ready = False
+
+
+@cache
+def get_dynamodb_client(config: Config = DEFAULT_CONFIG) -> Any:
+    """Get DynamoDB client.
 
-def get_dynamodb_client():
-    """Get DynamoDB client."""
+    Args:
+        config: Botocore client configuration.
+    """
     return boto3.client(
         "dynamodb",
         endpoint_url=settings.dynamodb_endpoint_url,
         region_name=settings.aws_region,
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
+        config=config,
     )
 
 
-def get_dynamodb_resource():
-    """Get DynamoDB resource."""
+@cache
+def get_dynamodb_resource(config: Config = DEFAULT_CONFIG) -> Any:
+    """Get DynamoDB resource.
+
+    Args:
+        config: Botocore client configuration.
+    """
     return boto3.resource(
         "dynamodb",
         endpoint_url=settings.dynamodb_endpoint_url,
         region_name=settings.aws_region,
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
+        config=config,
     )
 
 
 def create_sessions_table() -> bool:
     """Create sessions table if not exists.
 
+    An existing table gets the updated_at index and its items are
+    backfilled with the index key.
+
     Returns:
         True if table was created or already exists, False on error.
     """
     client = get_dynamodb_client()
     table_name = settings.dynamodb_table_name
 
+    try:
+        description = client.describe_table(TableName=table_name)["Table"]
+        return _ensure_updated_at_index(client, description) and _backfill_updated_at_index(
+            client, description["TableArn"]
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ResourceNotFoundException":
+            return False
+
+    try:
+        client.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {"AttributeName": "id", "KeyType": "HASH"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "id", "AttributeType": "S"},
+                *_UPDATED_AT_INDEX_ATTRIBUTES,
+            ],
+            GlobalSecondaryIndexes=[_UPDATED_AT_INDEX_SPEC],
+            BillingMode="PAY_PER_REQUEST",
+            # A new table has no items to backfill
+            Tags=[_BACKFILLED_TAG],
+        )
+        waiter = client.get_waiter("table_exists")
+        waiter.wait(TableName=table_name)
+        return True
+    except ClientError:
+        return False
+
+
+def create_messages_table() -> bool:
+    """Create messages table if not exists.
+
+    Messages are keyed by session ID and timestamp, so appending a message
+    is a single small write regardless of the conversation length.
+
+    Returns:
+        True if table was created or already exists, False on error.
+    """
+    client = get_dynamodb_client()
+    table_name = settings.dynamodb_messages_table_name
+
     try:
         client.describe_table(TableName=table_name)
         return True
@@ -49,9 +150,11 @@ def create_sessions_table() -> bool:
             TableName=table_name,
             KeySchema=[
                 {"AttributeName": "id", "KeyType": "HASH"},
+                {"AttributeName": "ts", "KeyType": "RANGE"},
             ],
             AttributeDefinitions=[
                 {"AttributeName": "id", "AttributeType": "S"},
+                {"AttributeName": "ts", "AttributeType": "S"},
             ],
             BillingMode="PAY_PER_REQUEST",
         )
@@ -62,6 +165,138 @@ def create_sessions_table() -> bool:
         return False
 
 
+def _ensure_updated_at_index(client: Any, description: dict[str, Any]) -> bool:
+    """Add the updated_at index to a sessions table created without it.
+
+    Args:
+        client: DynamoDB client.
+        description: Table description from describe_table.
+
+    Returns:
+        True if the index exists or is being created, False on error.
+    """
+    indexes = description.get("GlobalSecondaryIndexes", [])
+    if any(index["IndexName"] == UPDATED_AT_INDEX for index in indexes):
+        return True
+
+    try:
+        client.update_table(
+            TableName=description["TableName"],
+            AttributeDefinitions=_UPDATED_AT_INDEX_ATTRIBUTES,
+            GlobalSecondaryIndexUpdates=[{"Create": _UPDATED_AT_INDEX_SPEC}],
+        )
+        return True
+    except ClientError:
+        return False
+
+
+def _backfill_updated_at_index(client: Any, table_arn: str) -> bool:
+    """Add the index key to session items written before the index existed.
+
+    Those items also lack message_count, which is set from the messages
+    embedded in them. The table is tagged once every item is done, and a
+    tagged table is not scanned again. An interrupted backfill reruns on the
+    next startup, skipping items that already carry the key.
+
+    Args:
+        client: DynamoDB client.
+        table_arn: Sessions table ARN.
+
+    Returns:
+        True once every item carries the index key, False on error.
+    """
+    try:
+        if _is_backfilled(client, table_arn):
+            return True
+
+        table = get_table()
+        kwargs: dict[str, Any] = {
+            "FilterExpression": Attr("gsi_pk").not_exists(),
+            "ProjectionExpression": "id, messages",
+        }
+        while True:
+            response = table.scan(**kwargs)
+            for item in response.get("Items", []):
+                _backfill_session_item(table, item)
+            if "LastEvaluatedKey" not in response:
+                break
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        client.tag_resource(ResourceArn=table_arn, Tags=[_BACKFILLED_TAG])
+        return True
+    except ClientError:
+        return False
+
+
+def _backfill_session_item(table: Any, item: dict[str, Any]) -> None:
+    """Add the index key and message count to one legacy session item.
+
+    Args:
+        table: Sessions table resource.
+        item: Item with its id and embedded messages.
+    """
+    try:
+        table.update_item(
+            Key={"id": item["id"]},
+            UpdateExpression=(
+                "SET gsi_pk = :gsi_pk, message_count = if_not_exists(message_count, :count)"
+            ),
+            ConditionExpression="attribute_exists(id)",
+            ExpressionAttributeValues={
+                ":gsi_pk": UPDATED_AT_INDEX_PARTITION,
+                ":count": len(item.get("messages", [])),
+            },
+        )
+    except ClientError as e:
+        # The session was deleted since it was scanned
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+
+def _is_backfilled(client: Any, table_arn: str) -> bool:
+    """Check whether the sessions table carries the backfill tag.
+
+    Args:
+        client: DynamoDB client.
+        table_arn: Sessions table ARN.
+
+    Returns:
+        True if the backfill has finished.
+    """
+    tags = client.list_tags_of_resource(ResourceArn=table_arn).get("Tags", [])
+    return _BACKFILLED_TAG in tags
+
+
+def updated_at_index_ready() -> bool:
+    """Check whether sessions can be listed through the updated_at index.
+
+    The index is usable once it is active and the table carries the
+    backfill tag. Both are read from DynamoDB, so any process can tell; the
+    result is cached once it becomes true.
+
+    Returns:
+        True if the index lists every session, False otherwise.
+    """
+    global _updated_at_index_ready
+
+    if _updated_at_index_ready:
+        return True
+
+    client = get_dynamodb_client()
+    try:
+        description = client.describe_table(TableName=settings.dynamodb_table_name)["Table"]
+        index_active = any(
+            index["IndexName"] == UPDATED_AT_INDEX and index["IndexStatus"] == "ACTIVE"
+            for index in description.get("GlobalSecondaryIndexes", [])
+        )
+        _updated_at_index_ready = index_active and _is_backfilled(
+            client, description["TableArn"]
+        )
+    except ClientError:
+        return False
+    return _updated_at_index_ready
+
+
 def test_connection() -> bool:
     """Test DynamoDB connection.
 
@@ -76,7 +311,15 @@ def test_connection() -> bool:
         return False
 
 
-def get_table():
+@cache
+def get_table() -> Any:
     """Get sessions table resource."""
     resource = get_dynamodb_resource()
-    return resource.Table(settings.dynamodb_table_name)
\ No newline at end of file
+    return resource.Table(settings.dynamodb_table_name)
+
+
+@cache
+def get_messages_table() -> Any:
+    """Get messages table resource."""
+    resource = get_dynamodb_resource()
+    return resource.Table(settings.dynamodb_messages_table_name)
\ No newline at end of file
@@ -1,20 +1,44 @@
 """Session manager for DynamoDB operations."""
 
+import json
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
 
+import orjson
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
-from app.db import create_sessions_table, get_table
+from app.db import (
+    UPDATED_AT_INDEX,
+    UPDATED_AT_INDEX_PARTITION,
+    get_messages_table,
+    get_table,
+    updated_at_index_ready,
+)
 from app.session.models import Message, Session
 
+# TransactWriteItems accepts at most 100 actions per call
+_MAX_TRANSACT_ITEMS = 100
+
+# Session attributes needed to list sessions; skips messages embedded in
+# items written before messages moved to their own table
+_SUMMARY_PROJECTION = "id, #title, created_at, updated_at, message_count, total_tokens"
+_SUMMARY_ATTRIBUTE_NAMES = {"#title": "title"}
+
 
 class SessionManager:
-    """Manager for session CRUD operations."""
+    """Manager for session CRUD operations.
+
+    Session metadata lives in the sessions table; messages live in the
+    messages table keyed by (session ID, timestamp).
+    """
 
     def __init__(self) -> None:
-        create_sessions_table()
         self._table = get_table()
+        self._messages_table = get_messages_table()
 
     def create_session(self, title: str = "New Session") -> Session:
         """Create a new session.
@@ -25,11 +49,12 @@ class SessionManager:
         Returns:
             Created session.
         """
+        now = datetime.now(UTC)
         session = Session(
             id=str(uuid.uuid4()),
             title=title,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
         )
 
         self._table.put_item(Item=session.to_dict())
@@ -47,14 +72,17 @@ class SessionManager:
         try:
             response = self._table.get_item(Key={"id": session_id})
             item = response.get("Item")
-            if item:
-                return Session.from_dict(item)
-            return None
+            if not item:
+                return None
+
+            # Older sessions embed their messages in the session item
+            messages = [*item.get("messages", []), *self._query_messages(session_id)]
+            return Session.from_dict({**item, "messages": messages})
         except ClientError:
             return None
 
     def list_sessions(self, limit: int = 50) -> list[Session]:
-        """List all sessions.
+        """List the most recently updated sessions.
 
         Args:
             limit: Maximum number of sessions to return.
@@ -62,18 +90,50 @@ class SessionManager:
         Returns:
             List of sessions sorted by updated_at desc.
         """
+        # Until the index covers every session, read them all with a scan
+        if not updated_at_index_ready():
+            return self.list_all_sessions()[:limit]
+
         try:
-            response = self._table.scan(Limit=limit)
-            items = response.get("Items", [])
+            response = self._table.query(
+                IndexName=UPDATED_AT_INDEX,
+                KeyConditionExpression=Key("gsi_pk").eq(UPDATED_AT_INDEX_PARTITION),
+                ScanIndexForward=False,
+                Limit=limit,
+                ProjectionExpression=_SUMMARY_PROJECTION,
+                ExpressionAttributeNames=_SUMMARY_ATTRIBUTE_NAMES,
+            )
+            return [Session.from_dict(item) for item in response.get("Items", [])]
+        except ClientError:
+            return []
 
-            sessions = [Session.from_dict(item) for item in items]
-            sessions.sort(key=lambda s: s.updated_at, reverse=True)
-            return sessions
+    def list_all_sessions(self, total_segments: int = 4) -> list[Session]:
+        """List every session with a parallel scan.
+
+        Each segment is scanned to the end by its own worker thread.
+
+        Args:
+            total_segments: Number of scan segments read concurrently.
+
+        Returns:
+            All sessions sorted by updated_at desc.
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=total_segments) as executor:
+                segments = executor.map(
+                    lambda segment: self._scan_segment(segment, total_segments),
+                    range(total_segments),
+                )
+                items = [item for segment in segments for item in segment]
         except ClientError:
             return []
 
+        sessions = [Session.from_dict(item) for item in items]
+        sessions.sort(key=lambda session: session.updated_at, reverse=True)
+        return sessions
+
     def delete_session(self, session_id: str) -> bool:
-        """Delete a session.
+        """Delete a session and its messages.
 
         Args:
             session_id: Session ID.
@@ -83,12 +143,15 @@ class SessionManager:
         """
         try:
             self._table.delete_item(Key={"id": session_id})
+            with self._messages_table.batch_writer() as batch:
+                for item in self._query_messages(session_id):
+                    batch.delete_item(Key={"id": item["id"], "ts": item["ts"]})
             return True
         except ClientError:
             return False
 
     def update_session(self, session: Session) -> bool:
-        """Update a session.
+        """Update session metadata.
 
         Args:
             session: Session to update.
@@ -97,8 +160,23 @@ class SessionManager:
             True if updated, False otherwise.
         """
         try:
-            session.updated_at = datetime.utcnow()
-            self._table.put_item(Item=session.to_dict())
+            session.updated_at = datetime.now(UTC)
+            self._table.update_item(
+                Key={"id": session.id},
+                UpdateExpression=(
+                    "SET #title = :title, total_tokens = :tokens, "
+                    "message_count = :count, updated_at = :updated_at, gsi_pk = :gsi_pk"
+                ),
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeNames={"#title": "title"},
+                ExpressionAttributeValues={
+                    ":title": session.title,
+                    ":tokens": session.total_tokens,
+                    ":count": session.message_count,
+                    ":updated_at": session.updated_at.isoformat(),
+                    ":gsi_pk": UPDATED_AT_INDEX_PARTITION,
+                },
+            )
             return True
         except ClientError:
             return False
@@ -113,12 +191,64 @@ class SessionManager:
         Returns:
             True if added, False otherwise.
         """
-        session = self.get_session(session_id)
-        if not session:
-            return False
+        return self.add_messages(session_id, [message])
+
+    def add_messages(self, session_id: str, messages: list[Message]) -> bool:
+        """Add several messages to a session at once.
+
+        The session update and the message puts are committed in a single
+        TransactWriteItems call, conditional on the session existing. Bursts
+        too large for one transaction fall back to a conditional update
+        followed by BatchWriteItem.
+
+        Args:
+            session_id: Session ID.
+            messages: Messages to add, in order.
 
-        session.add_message(message)
-        return self.update_session(session)
+        Returns:
+            True if added, False otherwise.
+        """
+        if not messages:
+            return True
+
+        session_update = {
+            "Key": {"id": session_id},
+            "UpdateExpression": (
+                "SET updated_at = :updated_at, gsi_pk = :gsi_pk ADD message_count :count"
+            ),
+            "ConditionExpression": "attribute_exists(id)",
+            "ExpressionAttributeValues": {
+                ":updated_at": datetime.now(UTC).isoformat(),
+                ":gsi_pk": UPDATED_AT_INDEX_PARTITION,
+                ":count": len(messages),
+            },
+        }
+
+        try:
+            if len(messages) < _MAX_TRANSACT_ITEMS:
+                self._table.meta.client.transact_write_items(
+                    TransactItems=[
+                        {"Update": {"TableName": self._table.name, **session_update}},
+                        *(
+                            {
+                                "Put": {
+                                    "TableName": self._messages_table.name,
+                                    "Item": self._message_item(session_id, message),
+                                }
+                            }
+                            for message in messages
+                        ),
+                    ]
+                )
+                return True
+
+            self._table.update_item(**session_update)
+            with self._messages_table.batch_writer() as batch:
+                for message in messages:
+                    batch.put_item(Item=self._message_item(session_id, message))
+            return True
+        except ClientError:
+            return False
 
     def get_messages(self, session_id: str) -> list[Message]:
         """Get all messages from a session.
@@ -144,13 +274,22 @@ class SessionManager:
         Returns:
             True if updated, False otherwise.
         """
-        session = self.get_session(session_id)
-        if not session:
+        try:
+            self._table.update_item(
+                Key={"id": session_id},
+                UpdateExpression="SET #title = :title, updated_at = :updated_at, gsi_pk = :gsi_pk",
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeNames={"#title": "title"},
+                ExpressionAttributeValues={
+                    ":title": title,
+                    ":updated_at": datetime.now(UTC).isoformat(),
+                    ":gsi_pk": UPDATED_AT_INDEX_PARTITION,
+                },
+            )
+            return True
+        except ClientError:
             return False
 
-        session.title = title
-        return self.update_session(session)
-
     def update_tokens(self, session_id: str, tokens: int) -> bool:
         """Update total tokens used.
 
@@ -161,9 +300,77 @@ class SessionManager:
         Returns:
             True if updated, False otherwise.
         """
-        session = self.get_session(session_id)
-        if not session:
+        try:
+            self._table.update_item(
+                Key={"id": session_id},
+                UpdateExpression=(
+                    "SET updated_at = :updated_at, gsi_pk = :gsi_pk ADD total_tokens :tokens"
+                ),
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeValues={
+                    ":tokens": tokens,
+                    ":updated_at": datetime.now(UTC).isoformat(),
+                    ":gsi_pk": UPDATED_AT_INDEX_PARTITION,
+                },
+            )
+            return True
+        except ClientError:
             return False
 
-        session.total_tokens += tokens
-        return self.update_session(session)
\ No newline at end of file
+    def _query_messages(self, session_id: str) -> list[dict[str, Any]]:
+        """Query all message items of a session in timestamp order.
+
+        Args:
+            session_id: Session ID.
+
+        Returns:
+            Raw message items.
+        """
+        items: list[dict[str, Any]] = []
+        kwargs: dict[str, Any] = {"KeyConditionExpression": Key("id").eq(session_id)}
+        while True:
+            response = self._messages_table.query(**kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _scan_segment(self, segment: int, total_segments: int) -> list[dict[str, Any]]:
+        """Scan all session items of one parallel scan segment.
+
+        Args:
+            segment: Segment to scan.
+            total_segments: Total number of segments.
+
+        Returns:
+            Raw session items.
+        """
+        items: list[dict[str, Any]] = []
+        kwargs: dict[str, Any] = {
+            "Segment": segment,
+            "TotalSegments": total_segments,
+            "ProjectionExpression": _SUMMARY_PROJECTION,
+            "ExpressionAttributeNames": _SUMMARY_ATTRIBUTE_NAMES,
+        }
+        while True:
+            response = self._table.scan(**kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @staticmethod
+    def _message_item(session_id: str, message: Message) -> dict[str, Any]:
+        """Build the messages table item for a message.
+
+        Args:
+            session_id: Session ID.
+            message: Message to store.
+
+        Returns:
+            Item keyed by session ID and message timestamp.
+        """
+        # DynamoDB rejects floats, which tool results such as temperatures
+        # and search scores contain
+        item = json.loads(orjson.dumps(message.to_dict()), parse_float=Decimal)
+        return {"id": session_id, "ts": message.timestamp.isoformat(), **item}
@@ -1,12 +1,44 @@
 """Session and Message data models."""
 
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from decimal import Decimal
 from typing import Any
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, PrivateAttr
 
+from app.db import UPDATED_AT_INDEX_PARTITION
 
-class ToolCall(BaseModel):
+
+def _utcnow() -> datetime:
+    """Get the current time as an aware UTC datetime."""
+    return datetime.now(UTC)
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Parse a stored ISO timestamp, treating naive values as UTC.
+
+    Items written before timestamps were timezone-aware have no offset.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+def _decimal_default(obj: Any) -> int | float:
+    """Convert DynamoDB Decimal values for JSON serialization."""
+    if isinstance(obj, Decimal):
+        # Convert to int if it's a whole number, otherwise float
+        if obj % 1 == 0:
+            return int(obj)
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@dataclass(slots=True)
+class ToolCall:
     """Tool call information."""
 
     id: str
@@ -15,22 +47,39 @@ class ToolCall(BaseModel):
     result: dict[str, Any] | None = None
 
 
-class Message(BaseModel):
-    """Chat message model."""
+@dataclass(slots=True)
+class Message:
+    """Chat message model.
+
+    Internal, trusted data built from stored items and agent output, so it
+    skips pydantic validation.
+    """
 
-    role: str = Field(..., description="Message role: user, assistant, or tool")
-    content: str = Field(default="", description="Message content")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    tool_calls: list[ToolCall] = Field(default_factory=list)
+    role: str  # user, assistant, or tool
+    content: str = ""
+    timestamp: datetime = field(default_factory=_utcnow)
+    tool_calls: list[ToolCall] = field(default_factory=list)
+    _cached_dict: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for storage."""
-        return {
-            "role": self.role,
-            "content": self.content,
-            "timestamp": self.timestamp.isoformat(),
-            "tool_calls": [tc.model_dump() for tc in self.tool_calls],
-        }
+        """Convert to dictionary for storage.
+
+        Messages are not modified once created, so the result is computed
+        once and reused.
+        """
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "role": self.role,
+                "content": self.content,
+                "timestamp": self.timestamp.isoformat(),
+                "tool_calls": [
+                    {"id": tc.id, "name": tc.name, "input": tc.input, "result": tc.result}
+                    for tc in self.tool_calls
+                ],
+            }
+        return self._cached_dict
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Message":
@@ -38,108 +87,131 @@ class Message(BaseModel):
         return cls(
             role=data["role"],
             content=data.get("content", ""),
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            timestamp=_parse_datetime(data["timestamp"]),
             tool_calls=[ToolCall(**tc) for tc in data.get("tool_calls", [])],
         )
 
 
+def _to_api_messages(msg: Message) -> list[dict[str, Any]]:
+    """Convert a stored message to Claude API messages.
+
+    An assistant message with tool calls becomes a tool_use message followed
+    by a user message carrying the tool results.
+    """
+    if msg.role == "user":
+        return [{"role": "user", "content": msg.content}]
+    if msg.role != "assistant":
+        return []
+    if not msg.tool_calls:
+        return [{"role": "assistant", "content": msg.content}]
+
+    # Assistant message with tool calls
+    content = []
+    if msg.content:
+        content.append({"type": "text", "text": msg.content})
+    for tc in msg.tool_calls:
+        content.append({
+            "type": "tool_use",
+            "id": tc.id,
+            "name": tc.name,
+            "input": tc.input,
+        })
+    api_messages = [{"role": "assistant", "content": content}]
+
+    # Add tool results as user message (Claude API format)
+    tool_results = [
+        {
+            "type": "tool_result",
+            "tool_use_id": tc.id,
+            "content": orjson.dumps(tc.result, default=_decimal_default).decode(),
+        }
+        for tc in msg.tool_calls
+        if tc.result is not None
+    ]
+    if tool_results:
+        api_messages.append({"role": "user", "content": tool_results})
+    return api_messages
+
+
 class Session(BaseModel):
     """Chat session model."""
 
     id: str = Field(..., description="Unique session ID")
     title: str = Field(default="New Session", description="Session title")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
     messages: list[Message] = Field(default_factory=list)
+    message_count: int = Field(default=0, description="Number of messages")
     total_tokens: int = Field(default=0, description="Total tokens used")
 
+    _api_messages: list[dict[str, Any]] | None = PrivateAttr(default=None)
+
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for storage."""
+        """Convert to dictionary for storage.
+
+        Messages are stored separately in the messages table.
+        """
         return {
             "id": self.id,
+            "gsi_pk": UPDATED_AT_INDEX_PARTITION,
             "title": self.title,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
-            "messages": [msg.to_dict() for msg in self.messages],
+            "message_count": self.message_count,
             "total_tokens": self.total_tokens,
         }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Session":
         """Create from dictionary."""
+        messages = [Message.from_dict(m) for m in data.get("messages", [])]
         return cls(
             id=data["id"],
             title=data.get("title", "New Session"),
-            created_at=datetime.fromisoformat(data["created_at"]),
-            updated_at=datetime.fromisoformat(data["updated_at"]),
-            messages=[Message.from_dict(m) for m in data.get("messages", [])],
+            created_at=_parse_datetime(data["created_at"]),
+            updated_at=_parse_datetime(data["updated_at"]),
+            messages=messages,
+            message_count=data.get("message_count", len(messages)),
             total_tokens=data.get("total_tokens", 0),
         )
 
     def add_message(self, message: Message) -> None:
         """Add a message to the session."""
         self.messages.append(message)
-        self.updated_at = datetime.utcnow()
+        self.message_count += 1
+        self.updated_at = _utcnow()
+        if self._api_messages is not None:
+            self._api_messages.extend(_to_api_messages(message))
 
-    def get_messages_for_api(self) -> list[dict[str, Any]]:
+    def get_messages_for_api(self, max_messages: int | None = None) -> list[dict[str, Any]]:
         """Get messages in Claude API format.
         
         Includes tool_use and tool_result messages so that Claude can
         reference previous tool results and avoid redundant API calls.
+        The converted history is built once and then extended as messages
+        are added.
+
+        Args:
+            max_messages: Keep only the most recent API messages. The window
+                start moves forward in steps of half this limit, so the
+                prompt-cached prefix stays the same across the turns between
+                steps. It always starts on a plain user turn so tool results
+                keep their matching tool_use blocks.
         """
-        import json
-        from decimal import Decimal
-        
-        def decimal_default(obj):
-            """Convert Decimal to float for JSON serialization."""
-            if isinstance(obj, Decimal):
-                # Convert to int if it's a whole number, otherwise float
-                if obj % 1 == 0:
-                    return int(obj)
-                return float(obj)
-            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
-        
-        api_messages = []
-        for msg in self.messages:
-            if msg.role == "user":
-                api_messages.append({
-                    "role": "user",
-                    "content": msg.content,
-                })
-            elif msg.role == "assistant":
-                if msg.tool_calls:
-                    # Assistant message with tool calls
-                    content = []
-                    if msg.content:
-                        content.append({"type": "text", "text": msg.content})
-                    for tc in msg.tool_calls:
-                        content.append({
-                            "type": "tool_use",
-                            "id": tc.id,
-                            "name": tc.name,
-                            "input": tc.input,
-                        })
-                    api_messages.append({
-                        "role": "assistant",
-                        "content": content,
-                    })
-                    # Add tool results as user message (Claude API format)
-                    tool_results = []
-                    for tc in msg.tool_calls:
-                        if tc.result is not None:
-                            tool_results.append({
-                                "type": "tool_result",
-                                "tool_use_id": tc.id,
-                                "content": json.dumps(tc.result, ensure_ascii=False, default=decimal_default),
-                            })
-                    if tool_results:
-                        api_messages.append({
-                            "role": "user",
-                            "content": tool_results,
-                        })
-                else:
-                    api_messages.append({
-                        "role": "assistant",
-                        "content": msg.content,
-                    })
-        return api_messages
\ No newline at end of file
+        if self._api_messages is None:
+            self._api_messages = [
+                api_message for msg in self.messages for api_message in _to_api_messages(msg)
+            ]
+        api_messages = self._api_messages
+
+        start = 0
+        if max_messages is not None and len(api_messages) > max_messages:
+            step = max(max_messages // 2, 1)
+            overflow = len(api_messages) - max_messages
+            start = -(-overflow // step) * step
+            while start < len(api_messages) - 1 and (
+                api_messages[start]["role"] != "user"
+                or not isinstance(api_messages[start]["content"], str)
+            ):
+                start += 1
+        return api_messages[start:]
@@ -1,5 +1,6 @@
 """Session title generator using Claude."""
 import logging
+from collections import OrderedDict
 
 import anthropic
 
@@ -7,6 +8,21 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared across calls so the HTTP connection pool is reused
+_client = (
+    anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+    if settings.anthropic_api_key
+    else None
+)
+
+# Titles generated per first message, most recently used last
+_TITLE_CACHE_SIZE = 1024
+_title_cache: OrderedDict[str, str] = OrderedDict()
+
+# Messages up to this size are used as the title as they are
+_SHORT_TITLE_MAX_CHARS = 50
+_SHORT_TITLE_MAX_WORDS = 7
+
 
 async def generate_title(first_message: str) -> str:
     """Generate a session title from the first user message.
@@ -17,13 +33,19 @@ async def generate_title(first_message: str) -> str:
     Returns:
         Generated title (max 50 chars).
     """
-    if not settings.anthropic_api_key:
+    if _is_short(first_message):
+        return first_message.strip()
+
+    if _client is None:
         return _fallback_title(first_message)
 
-    try:
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+    cached = _title_cache.get(first_message)
+    if cached is not None:
+        _title_cache.move_to_end(first_message)
+        return cached
 
-        response = client.messages.create(
+    try:
+        response = await _client.messages.create(
             model="claude-3-haiku-20240307",
             max_tokens=50,
             messages=[
@@ -39,13 +61,35 @@ async def generate_title(first_message: str) -> str:
         title = response.content[0].text.strip()
         logger.info(f"generated title: {title}")
 
-        return title[:50] if len(title) > 50 else title
+        title = title[:50] if len(title) > 50 else title
+        _title_cache[first_message] = title
+        if len(_title_cache) > _TITLE_CACHE_SIZE:
+            _title_cache.popitem(last=False)
+        return title
 
     except Exception as e:
         logger.error(f"Failed to generate title: {e}")
         return _fallback_title(first_message)
 
 
+def _is_short(message: str) -> bool:
+    """Check whether a message is short enough to be a title by itself.
+
+    Args:
+        message: User message.
+
+    Returns:
+        True if the message can be used as the title without Claude.
+    """
+    message = message.strip()
+    return (
+        0 < len(message) <= _SHORT_TITLE_MAX_CHARS
+        and message.count(" ") < _SHORT_TITLE_MAX_WORDS
+        # Multi-line messages such as lists do not make a one-line title
+        and message.isprintable()
+    )
+
+
 def _fallback_title(message: str) -> str:
     """Generate fallback title from message.
 
@@ -73,7 +117,11 @@ async def regenerate_title_from_conversation(messages: list[dict]) -> str:
     if not messages:
         return "New Session"
 
-    if not settings.anthropic_api_key:
+    user_messages = [msg.get("content", "") for msg in messages if msg.get("role") == "user"]
+    if len(user_messages) == 1 and _is_short(user_messages[0]):
+        return user_messages[0].strip()
+
+    if _client is None:
         # Fallback: use first user message
         for msg in messages:
             if msg.get("role") == "user":
@@ -81,8 +129,6 @@ async def regenerate_title_from_conversation(messages: list[dict]) -> str:
         return "New Session"
 
     try:
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-
         # Build conversation summary
         conversation_text = "\n".join(
             f"{msg['role'].upper()}: {msg['content'][:200]}"
@@ -94,7 +140,7 @@ async def regenerate_title_from_conversation(messages: list[dict]) -> str:
         if len(conversation_text) > 1500:
             conversation_text = conversation_text[:1500] + "..."
 
-        response = client.messages.create(
+        response = await _client.messages.create(
             model="claude-3-haiku-20240307",
             max_tokens=50,
             messages=[
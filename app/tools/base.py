@@ -1,6 +1,7 @@
 """Base tool class for all tools."""
 
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Any
 
 from pydantic import BaseModel
@@ -36,7 +37,7 @@ class BaseTool(ABC):
         """Tool parameters schema."""
         ...
 
-    @property
+    @cached_property
     def required_parameters(self) -> list[str]:
         """List of required parameter names."""
         return [
@@ -63,6 +64,11 @@ class BaseTool(ABC):
         Returns:
             Tool definition in Claude API format.
         """
+        return self._claude_tool
+
+    @cached_property
+    def _claude_tool(self) -> dict[str, Any]:
+        """Tool definition in Claude API format, built once per tool."""
         properties = {}
         for name, param in self.parameters.items():
             prop: dict[str, Any] = {
@@ -1,14 +1,23 @@
 """Google Calendar tool for checking availability."""
 
+import asyncio
 import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
+from zoneinfo import ZoneInfo
 
+import httplib2
+from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
@@ -21,12 +30,81 @@ SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 TOKEN_PATH = Path("token.json")
 CREDENTIALS_PATH = Path("credentials.json")
 
+# Google Calendar accepts at most 50 requests per batch
+_MAX_BATCH_REQUESTS = 50
 
-def get_calendar_service():
-    """Get authenticated Google Calendar service."""
-    creds = None
+# Timezone used for date ranges and working hours
+_LOCAL_TZ = ZoneInfo("Asia/Seoul")
 
-    if TOKEN_PATH.exists():
+_ONE_DAY = timedelta(days=1)
+
+# Seconds before a Google Calendar request times out
+_HTTP_TIMEOUT = 10
+
+# Event fields used by the tool; the API leaves out everything else
+_EVENT_FIELDS = "items(summary,start,end,description,location)"
+
+
+class _TTLCache:
+    """Small LRU cache whose entries expire after a fixed time."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any | None:
+        """Get a cached value, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        """Drop a cached value."""
+        self._entries.pop(key, None)
+
+
+# Credentials loaded by get_calendar_credentials, and the access token
+# last written to token.json
+_cached_creds: Credentials | None = None
+_saved_token: str | None = None
+
+# Service built by get_calendar_service
+_service: Any = None
+
+# Guards building the shared service and its HTTP connection
+_service_lock = threading.Lock()
+
+# Accessible calendars, and events per (calendar ID, time_min, time_max)
+_calendar_list_cache = _TTLCache(maxsize=1, ttl=600)
+_events_cache = _TTLCache(maxsize=256, ttl=300)
+
+
+def get_calendar_credentials() -> Credentials:
+    """Get Google Calendar credentials, running the OAuth flow if needed.
+
+    Credentials are kept in memory; token.json is only read on the first
+    call and written when the token changes.
+    """
+    global _cached_creds, _saved_token
+    if _cached_creds is not None and _cached_creds.valid:
+        return _cached_creds
+
+    creds = _cached_creds
+    if creds is None and TOKEN_PATH.exists():
         creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
 
     if not creds or not creds.valid:
@@ -58,43 +136,116 @@ def get_calendar_service():
             )
             creds = flow.run_local_server(port=0)
 
-        with open(TOKEN_PATH, "w") as token:
-            token.write(creds.to_json())
+        _save_token(creds)
+
+    _cached_creds = creds
+    _saved_token = creds.token
+    return creds
+
+
+def _reset_calendar_auth() -> None:
+    """Drop the cached credentials and service."""
+    global _cached_creds, _service
+    _cached_creds = None
+    _service = None
+
+
+def _save_token(creds: Credentials) -> None:
+    """Write credentials to token.json atomically."""
+    tmp_path = TOKEN_PATH.with_name(f"{TOKEN_PATH.name}.tmp")
+    with open(tmp_path, "w") as token:
+        token.write(creds.to_json())
+    os.replace(tmp_path, TOKEN_PATH)
+
 
-    return build("calendar", "v3", credentials=creds)
+def _save_refreshed_token() -> None:
+    """Write the credentials back if the service's HTTP client refreshed them.
+
+    Must be called while holding ``_service_lock``.
+    """
+    global _saved_token
+    creds = _cached_creds
+    if creds is None or creds.token == _saved_token:
+        return
+    try:
+        _save_token(creds)
+        _saved_token = creds.token
+    except OSError as e:
+        logger.warning(f"Failed to save refreshed Google token: {e}")
+
+
+def get_calendar_service() -> Any:
+    """Get authenticated Google Calendar service.
+
+    Built once per process under ``_service_lock``, so concurrent first
+    calls share one build and one OAuth flow. Credentials are refreshed by
+    the service's HTTP client as they expire. Requests on the shared service
+    must hold ``_service_lock`` since httplib2 connections are not
+    thread-safe.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                http = AuthorizedHttp(
+                    get_calendar_credentials(), http=httplib2.Http(timeout=_HTTP_TIMEOUT)
+                )
+                _service = build("calendar", "v3", http=http, cache_discovery=False)
+    return _service
+
+
+@lru_cache(maxsize=128)
+def _parse_day(day: str) -> datetime:
+    """Parse a YYYY-MM-DD date as local midnight.
+
+    Args:
+        day: Date string.
+
+    Returns:
+        Timezone-aware datetime at the start of the day.
+    """
+    return datetime.fromisoformat(day).replace(
+        hour=0, minute=0, second=0, tzinfo=_LOCAL_TZ
+    )
 
 
 class GetCalendarAvailabilityTool(BaseTool):
     """Tool for getting calendar availability."""
 
+    NAME = "get_calendar_availability"
+
+    DESCRIPTION = (
+        "Get calendar events and available time slots for a given date range. "
+        "Returns existing events and free time slots from all accessible calendars."
+    )
+
+    PARAMETERS = {
+        "start_date": ToolParameter(
+            type="string",
+            description="Start date in YYYY-MM-DD format",
+        ),
+        "end_date": ToolParameter(
+            type="string",
+            description="End date in YYYY-MM-DD format",
+        ),
+        "calendar_id": ToolParameter(
+            type="string",
+            description="Calendar ID to check. Use 'all' to check all accessible calendars (default), or specify a specific calendar ID.",
+            default="all",
+        ),
+    }
+
     @property
     def name(self) -> str:
-        return "get_calendar_availability"
+        return self.NAME
 
     @property
     def description(self) -> str:
-        return (
-            "Get calendar events and available time slots for a given date range. "
-            "Returns existing events and free time slots from all accessible calendars."
-        )
+        return self.DESCRIPTION
 
     @property
     def parameters(self) -> dict[str, ToolParameter]:
-        return {
-            "start_date": ToolParameter(
-                type="string",
-                description="Start date in YYYY-MM-DD format",
-            ),
-            "end_date": ToolParameter(
-                type="string",
-                description="End date in YYYY-MM-DD format",
-            ),
-            "calendar_id": ToolParameter(
-                type="string",
-                description="Calendar ID to check. Use 'all' to check all accessible calendars (default), or specify a specific calendar ID.",
-                default="all",
-            ),
-        }
+        return self.PARAMETERS
 
     async def execute(self, **kwargs: Any) -> dict[str, Any]:
         """Get calendar availability.
@@ -112,19 +263,11 @@ class GetCalendarAvailabilityTool(BaseTool):
         calendar_id = kwargs.get("calendar_id", "all")
 
         try:
-            service = get_calendar_service()
-
-            # Parse dates and add timezone info
-            # Using local timezone for proper time range
-            from zoneinfo import ZoneInfo
-            local_tz = ZoneInfo("Asia/Seoul")
-            
-            start_dt = datetime.fromisoformat(start_date).replace(
-                hour=0, minute=0, second=0, tzinfo=local_tz
-            )
-            end_dt = (datetime.fromisoformat(end_date) + timedelta(days=1)).replace(
-                hour=0, minute=0, second=0, tzinfo=local_tz
-            )
+            service = await asyncio.to_thread(get_calendar_service)
+
+            # Parse dates as local midnights for proper time range
+            start_dt = _parse_day(start_date)
+            end_dt = _parse_day(end_date) + timedelta(days=1)
 
             # Format as RFC 3339 for Google Calendar API
             time_min = start_dt.isoformat()
@@ -136,37 +279,45 @@ class GetCalendarAvailabilityTool(BaseTool):
             # Determine which calendars to fetch from
             if calendar_id == "all":
                 # Get all accessible calendars
-                calendar_list = service.calendarList().list().execute()
-                calendars = calendar_list.get("items", [])
-                calendar_ids = [(cal["id"], cal.get("summary", cal["id"])) for cal in calendars]
+                calendar_ids = _calendar_list_cache.get("all")
+                if calendar_ids is None:
+                    calendar_list = await asyncio.to_thread(
+                        self._execute, service.calendarList().list()
+                    )
+                    calendars = calendar_list.get("items", [])
+                    calendar_ids = [(cal["id"], cal.get("summary", cal["id"])) for cal in calendars]
+                    _calendar_list_cache.set("all", calendar_ids)
                 logger.info(f"Found {len(calendar_ids)} calendars to check")
             else:
                 calendar_ids = [(calendar_id, calendar_id)]
 
-            # Fetch events from all selected calendars
-            all_events = []
+            # Reuse recently fetched events; only the other calendars are
+            # fetched, in batched requests
+            events_by_calendar = {}
+            missing = []
             for cal_id, cal_name in calendar_ids:
-                try:
-                    events_result = (
-                        service.events()
-                        .list(
-                            calendarId=cal_id,
-                            timeMin=time_min,
-                            timeMax=time_max,
-                            singleEvents=True,
-                            orderBy="startTime",
-                        )
-                        .execute()
-                    )
-                    events = events_result.get("items", [])
-                    logger.info(f"Calendar '{cal_name}': found {len(events)} events")
-                    
-                    # Add calendar info to each event
-                    for event in events:
-                        event["_calendar_name"] = cal_name
-                    all_events.extend(events)
-                except Exception as e:
-                    logger.warning(f"Failed to fetch from calendar '{cal_name}': {e}")
+                events = _events_cache.get((cal_id, time_min, time_max))
+                if events is None:
+                    missing.append((cal_id, cal_name))
+                else:
+                    events_by_calendar[cal_id] = events
+
+            if missing:
+                fetched = await asyncio.to_thread(
+                    self._fetch_events, service, missing, time_min, time_max
+                )
+                for cal_id, _ in missing:
+                    if cal_id in fetched:
+                        _events_cache.set((cal_id, time_min, time_max), fetched[cal_id])
+                    else:
+                        _events_cache.pop((cal_id, time_min, time_max))
+                events_by_calendar.update(fetched)
+
+            all_events = [
+                event
+                for cal_id, _ in calendar_ids
+                for event in events_by_calendar.get(cal_id, [])
+            ]
 
             logger.info(f"Total events found: {len(all_events)}")
 
@@ -200,6 +351,9 @@ class GetCalendarAvailabilityTool(BaseTool):
             }
 
         except Exception as e:
+            if isinstance(e, RefreshError):
+                # Credentials were revoked; authenticate again on the next call
+                _reset_calendar_auth()
             logger.error(f"Error fetching calendar events: {e}")
             return {
                 "success": False,
@@ -208,6 +362,71 @@ class GetCalendarAvailabilityTool(BaseTool):
                 "free_slots": [],
             }
 
+    @staticmethod
+    def _fetch_events(
+        service: Any,
+        calendar_ids: list[tuple[str, str]],
+        time_min: str,
+        time_max: str,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Fetch the events of several calendars through the batch endpoint.
+
+        Args:
+            service: Google Calendar service.
+            calendar_ids: (calendar ID, calendar name) pairs.
+            time_min: Range start (RFC 3339).
+            time_max: Range end (RFC 3339).
+
+        Returns:
+            Events per calendar ID, each tagged with ``_calendar_name``.
+            Calendars that failed to load are left out.
+        """
+        events_by_calendar: dict[str, list[dict[str, Any]]] = {}
+
+        def collect(
+            request_id: str, response: dict[str, Any], exception: Exception | None
+        ) -> None:
+            cal_id, cal_name = calendar_ids[int(request_id)]
+            if exception is not None:
+                logger.warning(f"Failed to fetch from calendar '{cal_name}': {exception}")
+                return
+            events = response.get("items", [])
+            logger.info(f"Calendar '{cal_name}': found {len(events)} events")
+
+            # Add calendar info to each event
+            for event in events:
+                event["_calendar_name"] = cal_name
+            events_by_calendar[cal_id] = events
+
+        for offset in range(0, len(calendar_ids), _MAX_BATCH_REQUESTS):
+            chunk = calendar_ids[offset:offset + _MAX_BATCH_REQUESTS]
+            batch = service.new_batch_http_request(callback=collect)
+            for i, (cal_id, _) in enumerate(chunk, start=offset):
+                batch.add(
+                    service.events().list(
+                        calendarId=cal_id,
+                        timeMin=time_min,
+                        timeMax=time_max,
+                        singleEvents=True,
+                        orderBy="startTime",
+                        fields=_EVENT_FIELDS,
+                    ),
+                    request_id=str(i),
+                )
+            with _service_lock:
+                batch.execute()
+                _save_refreshed_token()
+
+        return events_by_calendar
+
+    @staticmethod
+    def _execute(request: Any) -> dict[str, Any]:
+        """Execute a request on the shared service."""
+        with _service_lock:
+            response = request.execute()
+            _save_refreshed_token()
+            return cast(dict[str, Any], response)
+
     def _calculate_free_slots(
         self,
         events: list[dict],
@@ -216,22 +435,23 @@ class GetCalendarAvailabilityTool(BaseTool):
     ) -> list[dict]:
         """Calculate free time slots between events."""
         free_slots = []
-        current = start_dt
+        current = start_dt.date()
+        end = end_dt.date()
 
-        while current < end_dt:
-            # Working hours: 9AM to 6PM
-            day_start = current.replace(hour=9, minute=0, second=0)
-            day_end = current.replace(hour=18, minute=0, second=0)
+        # Bucket events by their start date (YYYY-MM-DD prefix) once
+        events_by_day: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for event in events:
+            events_by_day[event["start"][:10]].append(event)
 
+        # Working hours: 9AM to 6PM
+        while current < end:
             # Get events for this day
-            day_events = [
-                e for e in events
-                if e["start"].startswith(current.strftime("%Y-%m-%d"))
-            ]
+            day = current.isoformat()
+            day_events = events_by_day.get(day, [])
 
             if not day_events:
                 free_slots.append({
-                    "date": current.strftime("%Y-%m-%d"),
+                    "date": day,
                     "start": "09:00",
                     "end": "18:00",
                     "duration_hours": 9,
@@ -239,11 +459,11 @@ class GetCalendarAvailabilityTool(BaseTool):
             else:
                 # Simplified: just note the day has events
                 free_slots.append({
-                    "date": current.strftime("%Y-%m-%d"),
+                    "date": day,
                     "events_count": len(day_events),
                     "note": "Partial availability - check events for details",
                 })
 
-            current += timedelta(days=1)
+            current += _ONE_DAY
 
         return free_slots
\ No newline at end of file
@@ -10,6 +10,7 @@ class ToolRegistry:
 
     def __init__(self) -> None:
         self._tools: dict[str, BaseTool] = {}
+        self._claude_tools: list[dict[str, Any]] | None = None
 
     def register(self, tool: BaseTool) -> None:
         """Register a tool.
@@ -18,6 +19,7 @@ class ToolRegistry:
             tool: Tool instance to register.
         """
         self._tools[tool.name] = tool
+        self._claude_tools = None
 
     def get(self, name: str) -> BaseTool | None:
         """Get a tool by name.
@@ -49,10 +51,15 @@ class ToolRegistry:
     def to_claude_tools(self) -> list[dict[str, Any]]:
         """Convert all tools to Claude tool use format.
 
+        The list is built once and reused until another tool is registered,
+        so callers must not modify it.
+
         Returns:
             List of tool definitions in Claude API format.
         """
-        return [tool.to_claude_tool() for tool in self._tools.values()]
+        if self._claude_tools is None:
+            self._claude_tools = [tool.to_claude_tool() for tool in self._tools.values()]
+        return self._claude_tools
 
     async def execute(self, name: str, **kwargs: Any) -> dict[str, Any]:
         """Execute a tool by name.
@@ -1,49 +1,62 @@
 """OpenWeatherMap tool for weather forecasts."""
 
+import math
+from collections import Counter
+from itertools import groupby
 from typing import Any
 
-import requests
+import httpx
+import orjson
 
 from app.config import settings
 from app.tools.base import BaseTool, ToolParameter
 
 OPENWEATHERMAP_BASE_URL = "https://api.openweathermap.org/data/2.5"
 
+# Shared so connections to OpenWeatherMap are kept alive across calls
+_http = httpx.AsyncClient(timeout=10)
+
 
 class GetWeatherForecastTool(BaseTool):
     """Tool for getting weather forecast."""
 
+    NAME = "get_weather_forecast"
+
+    DESCRIPTION = (
+        "Get weather forecast for a specific location. "
+        "Returns temperature, weather condition, precipitation probability, "
+        "and other weather data for the next 5 days."
+    )
+
+    PARAMETERS = {
+        "city": ToolParameter(
+            type="string",
+            description="City name (e.g., 'Seoul', 'Tokyo', 'New York')",
+        ),
+        "country_code": ToolParameter(
+            type="string",
+            description="ISO 3166 country code (e.g., 'KR', 'JP', 'US')",
+            default="",
+        ),
+        "units": ToolParameter(
+            type="string",
+            description="Units for temperature",
+            enum=["metric", "imperial"],
+            default="metric",
+        ),
+    }
+
     @property
     def name(self) -> str:
-        return "get_weather_forecast"
+        return self.NAME
 
     @property
     def description(self) -> str:
-        return (
-            "Get weather forecast for a specific location. "
-            "Returns temperature, weather condition, precipitation probability, "
-            "and other weather data for the next 5 days."
-        )
+        return self.DESCRIPTION
 
     @property
     def parameters(self) -> dict[str, ToolParameter]:
-        return {
-            "city": ToolParameter(
-                type="string",
-                description="City name (e.g., 'Seoul', 'Tokyo', 'New York')",
-            ),
-            "country_code": ToolParameter(
-                type="string",
-                description="ISO 3166 country code (e.g., 'KR', 'JP', 'US')",
-                default="",
-            ),
-            "units": ToolParameter(
-                type="string",
-                description="Units for temperature",
-                enum=["metric", "imperial"],
-                default="metric",
-            ),
-        }
+        return self.PARAMETERS
 
     async def execute(self, **kwargs: Any) -> dict[str, Any]:
         """Get weather forecast.
@@ -73,7 +86,7 @@ class GetWeatherForecastTool(BaseTool):
                 location = f"{city},{country_code}"
 
             # Get 5-day forecast
-            response = requests.get(
+            response = await _http.get(
                 f"{OPENWEATHERMAP_BASE_URL}/forecast",
                 params={
                     "q": location,
@@ -81,10 +94,9 @@ class GetWeatherForecastTool(BaseTool):
                     "units": units,
                     "cnt": 40,  # 5 days * 8 (3-hour intervals)
                 },
-                timeout=10,
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Process forecast data
             forecasts = self._process_forecast(data, units)
@@ -102,7 +114,7 @@ class GetWeatherForecastTool(BaseTool):
                 },
             }
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return {
                     "success": False,
@@ -122,45 +134,55 @@ class GetWeatherForecastTool(BaseTool):
         self, data: dict, units: str
     ) -> list[dict[str, Any]]:
         """Process raw forecast data into daily summaries."""
-        daily_forecasts: dict[str, list] = {}
-
-        for item in data["list"]:
-            date = item["dt_txt"].split(" ")[0]
-            if date not in daily_forecasts:
-                daily_forecasts[date] = []
-            daily_forecasts[date].append(item)
-
         forecasts = []
-        for date, items in daily_forecasts.items():
-            temps = [item["main"]["temp"] for item in items]
-            feels_like = [item["main"]["feels_like"] for item in items]
-            humidity = [item["main"]["humidity"] for item in items]
-
-            # Get precipitation probability (if available)
-            pop = [item.get("pop", 0) * 100 for item in items]
-
-            # Get most common weather condition
-            conditions = [item["weather"][0]["main"] for item in items]
-            main_condition = max(set(conditions), key=conditions.count)
 
-            descriptions = [item["weather"][0]["description"] for item in items]
-            main_description = max(set(descriptions), key=descriptions.count)
+        # Items are ordered by time, so each day is one consecutive group;
+        # dt_txt is "YYYY-MM-DD HH:MM:SS"
+        for date, items in groupby(data["list"], key=lambda item: item["dt_txt"][:10]):
+            # Aggregate every field in a single pass over the day's items
+            count = 0
+            temp_min = feels_min = math.inf
+            temp_max = feels_max = -math.inf
+            temp_sum = humidity_sum = 0.0
+            pop_max = 0.0
+            conditions: Counter[str] = Counter()
+            descriptions: Counter[str] = Counter()
+
+            for item in items:
+                count += 1
+                main = item["main"]
+                temp = main["temp"]
+                feels_like = main["feels_like"]
+                temp_min = min(temp_min, temp)
+                temp_max = max(temp_max, temp)
+                temp_sum += temp
+                feels_min = min(feels_min, feels_like)
+                feels_max = max(feels_max, feels_like)
+                humidity_sum += main["humidity"]
+
+                # Get precipitation probability (if available)
+                pop_max = max(pop_max, item.get("pop", 0) * 100)
+
+                weather = item["weather"][0]
+                conditions[weather["main"]] += 1
+                descriptions[weather["description"]] += 1
 
             forecasts.append({
                 "date": date,
                 "temperature": {
-                    "min": round(min(temps), 1),
-                    "max": round(max(temps), 1),
-                    "avg": round(sum(temps) / len(temps), 1),
+                    "min": round(temp_min, 1),
+                    "max": round(temp_max, 1),
+                    "avg": round(temp_sum / count, 1),
                 },
                 "feels_like": {
-                    "min": round(min(feels_like), 1),
-                    "max": round(max(feels_like), 1),
+                    "min": round(feels_min, 1),
+                    "max": round(feels_max, 1),
                 },
-                "humidity_avg": round(sum(humidity) / len(humidity)),
-                "precipitation_probability": round(max(pop)),
-                "condition": main_condition,
-                "description": main_description,
+                "humidity_avg": round(humidity_sum / count),
+                "precipitation_probability": round(pop_max),
+                # Most common weather condition
+                "condition": conditions.most_common(1)[0][0],
+                "description": descriptions.most_common(1)[0][0],
             })
 
-        return forecasts
\ No newline at end of file
+        return forecasts
@@ -1,5 +1,6 @@
 """Tavily web search tool."""
 
+import asyncio
 from typing import Any
 
 from tavily import TavilyClient
@@ -7,42 +8,51 @@ from tavily import TavilyClient
 from app.config import settings
 from app.tools.base import BaseTool, ToolParameter
 
+# Created on first use and shared so HTTP connections are reused
+_client: TavilyClient | None = None
+
 
 class WebSearchTool(BaseTool):
     """Tool for web search using Tavily API."""
 
+    NAME = "web_search"
+
+    DESCRIPTION = (
+        "Search the web for information about events, places, activities, "
+        "recommendations, and other relevant information for planning. "
+        "Use this to find local events, restaurant recommendations, "
+        "tourist attractions, and more."
+    )
+
+    PARAMETERS = {
+        "query": ToolParameter(
+            type="string",
+            description="Search query",
+        ),
+        "search_depth": ToolParameter(
+            type="string",
+            description="Search depth - 'basic' for quick search, 'advanced' for comprehensive",
+            enum=["basic", "advanced"],
+            default="basic",
+        ),
+        "max_results": ToolParameter(
+            type="integer",
+            description="Maximum number of results to return (1-10)",
+            default="5",
+        ),
+    }
+
     @property
     def name(self) -> str:
-        return "web_search"
+        return self.NAME
 
     @property
     def description(self) -> str:
-        return (
-            "Search the web for information about events, places, activities, "
-            "recommendations, and other relevant information for planning. "
-            "Use this to find local events, restaurant recommendations, "
-            "tourist attractions, and more."
-        )
+        return self.DESCRIPTION
 
     @property
     def parameters(self) -> dict[str, ToolParameter]:
-        return {
-            "query": ToolParameter(
-                type="string",
-                description="Search query",
-            ),
-            "search_depth": ToolParameter(
-                type="string",
-                description="Search depth - 'basic' for quick search, 'advanced' for comprehensive",
-                enum=["basic", "advanced"],
-                default="basic",
-            ),
-            "max_results": ToolParameter(
-                type="integer",
-                description="Maximum number of results to return (1-10)",
-                default="5",
-            ),
-        }
+        return self.PARAMETERS
 
     async def execute(self, **kwargs: Any) -> dict[str, Any]:
         """Execute web search.
@@ -66,9 +76,13 @@ class WebSearchTool(BaseTool):
             }
 
         try:
-            client = TavilyClient(api_key=settings.tavily_api_key)
+            global _client
+            if _client is None:
+                _client = TavilyClient(api_key=settings.tavily_api_key)
 
-            response = client.search(
+            # TavilyClient is blocking; keep it off the event loop
+            response = await asyncio.to_thread(
+                _client.search,
                 query=query,
                 search_depth=search_depth,
                 max_results=min(max_results, 10),
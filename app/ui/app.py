@@ -1,12 +1,43 @@
 """Streamlit UI for SkyPlanner."""
 
-import json
+import queue
+import threading
+import time
+from collections.abc import Iterator
 
+import orjson
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+from urllib3.util.retry import Retry
 
 API_BASE_URL = "http://localhost:8001/api"
 
+# Minimum seconds between re-renders of a streaming response
+RENDER_INTERVAL = 0.05
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Get the HTTP session shared across reruns.
+
+    Keeps connections to the API alive instead of reconnecting per call.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    )
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+        "User-Agent": "SkyPlanner-UI/1.0",
+    })
+    return session
+
 
 def init_session_state():
     """Initialize session state."""
@@ -16,12 +47,25 @@ def init_session_state():
         st.session_state.messages = []
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_sessions() -> list[dict]:
+    """Load the session list with sidebar display titles.
+
+    Errors are raised so they are not cached.
+    """
+    response = get_http_session().get(f"{API_BASE_URL}/sessions", timeout=10)
+    response.raise_for_status()
+    sessions = orjson.loads(response.content)["sessions"]
+    for session in sessions:
+        title = session["title"]
+        session["display_title"] = title[:30] + "..." if len(title) > 30 else title
+    return sessions
+
+
 def fetch_sessions():
     """Fetch all sessions from API."""
     try:
-        response = requests.get(f"{API_BASE_URL}/sessions", timeout=10)
-        response.raise_for_status()
-        return response.json()["sessions"]
+        return _load_sessions()
     except Exception:
         return []
 
@@ -29,13 +73,14 @@ def fetch_sessions():
 def create_session():
     """Create a new session."""
     try:
-        response = requests.post(
+        response = get_http_session().post(
             f"{API_BASE_URL}/sessions",
             json={"title": "New Session"},
             timeout=10,
         )
         response.raise_for_status()
-        return response.json()
+        _load_sessions.clear()
+        return orjson.loads(response.content)
     except Exception:
         return None
 
@@ -43,11 +88,13 @@ def create_session():
 def delete_session(session_id: str):
     """Delete a session."""
     try:
-        response = requests.delete(
+        response = get_http_session().delete(
             f"{API_BASE_URL}/sessions/{session_id}",
             timeout=10,
         )
         response.raise_for_status()
+        _load_sessions.clear()
+        _load_session_detail.clear(session_id)
         return True
     except Exception:
         return False
@@ -56,33 +103,73 @@ def delete_session(session_id: str):
 def regenerate_title(session_id: str):
     """Regenerate session title."""
     try:
-        response = requests.post(
+        response = get_http_session().post(
             f"{API_BASE_URL}/sessions/{session_id}/regenerate-title",
             timeout=30,
         )
         response.raise_for_status()
-        return response.json().get("title")
+        _load_sessions.clear()
+        return orjson.loads(response.content).get("title")
     except Exception:
         return None
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_session_detail(session_id: str) -> dict:
+    """Load a session with its messages; errors are raised so they are not cached."""
+    response = get_http_session().get(
+        f"{API_BASE_URL}/sessions/{session_id}",
+        timeout=10,
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
 def fetch_session_detail(session_id: str):
     """Fetch session detail."""
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/sessions/{session_id}",
-            timeout=10,
-        )
-        response.raise_for_status()
-        return response.json()
+        return _load_session_detail(session_id)
     except Exception:
         return None
 
 
+def iter_sse(response: requests.Response) -> Iterator[tuple[str, str]]:
+    """Parse server-sent events from a streaming response.
+
+    Chunks are handled as soon as they arrive, and an event may span
+    several chunks and several data lines.
+
+    Yields:
+        (event type, data) for each event that carries data.
+    """
+    response.encoding = "utf-8"
+    buffer = ""
+    for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+        buffer += chunk.replace("\r\n", "\n")
+        while "\n\n" in buffer:
+            block, buffer = buffer.split("\n\n", 1)
+            # Blank blocks are keepalives
+            if not block:
+                continue
+            event_type = "message"
+            data_lines = []
+            for line in block.split("\n"):
+                # Comment lines (": ping") carry no fields
+                if not line or line[0] == ":":
+                    continue
+                field, _, value = line.partition(":")
+                if field == "event":
+                    event_type = value.strip()
+                elif field == "data":
+                    data_lines.append(value.removeprefix(" "))
+            if data_lines:
+                yield event_type, "\n".join(data_lines)
+
+
 def stream_chat(session_id: str, message: str):
     """Stream chat response."""
     try:
-        response = requests.post(
+        response = get_http_session().post(
             f"{API_BASE_URL}/sessions/{session_id}/chat",
             json={"message": message},
             stream=True,
@@ -90,18 +177,23 @@ def stream_chat(session_id: str, message: str):
         )
         response.raise_for_status()
 
-        for line in response.iter_lines():
-            if line:
-                line = line.decode("utf-8")
-                if line.startswith("event:"):
-                    event_type = line.split(":", 1)[1].strip()
-                elif line.startswith("data:"):
-                    data = json.loads(line.split(":", 1)[1].strip())
-                    yield event_type, data
+        for event_type, data in iter_sse(response):
+            yield event_type, orjson.loads(data)
     except Exception as e:
         yield "error", {"error": str(e)}
 
 
+def drain_events(events: Iterator[tuple[str, dict]], out: queue.Queue) -> None:
+    """Move events from a stream into a queue as soon as they arrive."""
+    for event in events:
+        out.put(event)
+
+
+def format_json(value) -> str:
+    """Pretty-print a JSON value for display."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+
+
 def render_sidebar():
     """Render sidebar with session list."""
     with st.sidebar:
@@ -110,54 +202,82 @@ def render_sidebar():
 
         st.divider()
 
-        # New session button
-        if st.button("+ New Session", use_container_width=True):
-            session = create_session()
-            if session:
-                st.session_state.current_session_id = session["id"]
-                st.session_state.messages = []
-                st.rerun()
+        render_session_list()
+
+
+@st.fragment
+def render_session_list():
+    """Render session controls.
+
+    Runs as a fragment so sidebar clicks only rerun the sidebar; the whole
+    app reruns only when the selected session changes.
+    """
+    # New session button. The in-flight flag outlives the creating run so a
+    # second click queued during the request is ignored on the next run.
+    creating = st.session_state.pop("_creating", False)
+    if st.button("+ New Session", use_container_width=True) and not creating:
+        st.session_state._creating = True
+        session = create_session()
+        if session:
+            st.session_state.current_session_id = session["id"]
+            st.session_state.messages = []
+            st.rerun()
+        st.session_state._creating = False
+
+    st.divider()
+
+    # Session list
+    st.subheader("Sessions")
+    sessions = fetch_sessions()
+
+    current_id = st.session_state.current_session_id
+
+    # One table for the whole list rather than a row of columns per session.
+    # The key follows the current session and the list order, so a stale
+    # selection never points at a different session after a reorder.
+    order = hash(tuple(session["id"] for session in sessions))
+    selection = st.dataframe(
+        [
+            {
+                "current": "▶" if session["id"] == current_id else "",
+                "title": session["display_title"],
+            }
+            for session in sessions
+        ],
+        column_config={
+            "current": st.column_config.TextColumn("", width="small"),
+            "title": st.column_config.TextColumn("Title"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"sessions_{current_id}_{order}",
+    )
+    rows = selection.selection.rows
+    if rows and sessions[rows[0]]["id"] != current_id:
+        st.session_state.current_session_id = sessions[rows[0]]["id"]
+        # Messages are loaded by render_chat
+        st.session_state.messages = None
+        st.rerun()
+
+    # Actions on the current session
+    if not any(session["id"] == current_id for session in sessions):
+        return
 
-        st.divider()
+    col1, col2 = st.columns(2)
 
-        # Session list
-        st.subheader("Sessions")
-        sessions = fetch_sessions()
-
-        for session in sessions:
-            col1, col2, col3 = st.columns([4, 1, 1])
-
-            with col1:
-                is_current = session["id"] == st.session_state.current_session_id
-                if st.button(
-                    session["title"][:30] + ("..." if len(session["title"]) > 30 else ""),
-                    key=f"session_{session['id']}",
-                    use_container_width=True,
-                    type="primary" if is_current else "secondary",
-                ):
-                    st.session_state.current_session_id = session["id"]
-                    # Load messages
-                    detail = fetch_session_detail(session["id"])
-                    if detail:
-                        st.session_state.messages = [
-                            {"role": m["role"], "content": m["content"]}
-                            for m in detail["messages"]
-                        ]
-                    st.rerun()
-
-            with col2:
-                if st.button("🔄", key=f"regenerate_{session['id']}", help="제목 재생성"):
-                    new_title = regenerate_title(session["id"])
-                    if new_title:
-                        st.rerun()
-
-            with col3:
-                if st.button("🗑️", key=f"delete_{session['id']}"):
-                    if delete_session(session["id"]):
-                        if st.session_state.current_session_id == session["id"]:
-                            st.session_state.current_session_id = None
-                            st.session_state.messages = []
-                        st.rerun()
+    with col1:
+        if st.button("🔄", key="regenerate", help="제목 재생성", use_container_width=True):
+            if regenerate_title(current_id):
+                st.rerun(scope="fragment")
+
+    with col2:
+        if st.button("🗑️", key="delete", use_container_width=True):
+            if delete_session(current_id):
+                st.session_state.current_session_id = None
+                st.session_state.messages = []
+                st.rerun()
 
 
 def render_chat():
@@ -166,68 +286,127 @@ def render_chat():
         st.info("Select a session or create a new one to start chatting.")
         return
 
-    # Display messages
+    # Load messages of a newly selected session
+    if st.session_state.messages is None:
+        detail = fetch_session_detail(st.session_state.current_session_id)
+        st.session_state.messages = [
+            {"role": m["role"], "content": m["content"]}
+            for m in (detail["messages"] if detail else [])
+        ]
+
+    render_history()
+
+    # Chat input
+    if prompt := st.chat_input("Ask about weather, schedules, or planning..."):
+        render_response(prompt)
+
+
+def render_history():
+    """Render the messages of the current session."""
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
-    # Chat input
-    if prompt := st.chat_input("Ask about weather, schedules, or planning..."):
-        # Add user message
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        with st.chat_message("user"):
-            st.markdown(prompt)
-
-        # Stream assistant response
-        with st.chat_message("assistant"):
-            response_placeholder = st.empty()
-            tool_container = st.container()
-
-            full_response = ""
-            tool_calls = []
-
-            for event_type, data in stream_chat(
-                st.session_state.current_session_id, prompt
-            ):
-                if event_type == "title":
-                    # Session title updated
-                    pass
-
-                elif event_type == "text":
-                    full_response += data.get("content", "")
-                    response_placeholder.markdown(full_response + "▌")
-
-                elif event_type == "tool_use":
-                    tool_name = data.get("name", "Unknown")
-                    tool_input = data.get("input", {})
-                    tool_calls.append({"name": tool_name, "input": tool_input})
-
-                    with tool_container:
-                        with st.expander(f"🔧 Using tool: {tool_name}", expanded=False):
-                            st.json(tool_input)
-
-                elif event_type == "tool_result":
-                    result = data.get("result", {})
-                    if tool_calls:
-                        with tool_container:
-                            with st.expander(
-                                f"📊 Result from: {tool_calls[-1]['name']}",
-                                expanded=False,
-                            ):
-                                st.json(result)
-
-                elif event_type == "done":
-                    response_placeholder.markdown(full_response)
-
-                elif event_type == "error":
-                    st.error(f"Error: {data.get('error', 'Unknown error')}")
-
-            # Add assistant message to history
-            if full_response:
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": full_response,
-                })
+
+def render_response(prompt: str):
+    """Send a prompt and stream the assistant response below the history."""
+    # Add user message
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+
+    # Stream assistant response
+    with st.chat_message("assistant"):
+        tool_container = st.container()
+        full_response = st.write_stream(
+            stream_text(st.session_state.current_session_id, prompt, tool_container)
+        )
+
+        # Add assistant message to history
+        if full_response:
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": full_response,
+            })
+
+        # The chat changed the session's messages, title and order
+        _load_sessions.clear()
+        _load_session_detail.clear(st.session_state.current_session_id)
+
+
+def stream_text(session_id: str, prompt: str, tool_container) -> Iterator[str]:
+    """Stream the reply text of a chat, rendering other events on the side.
+
+    Text deltas are coalesced so st.write_stream re-renders at a bounded
+    rate rather than per chunk. Tool calls, tool results and errors are
+    written to tool_container.
+
+    Yields:
+        Pieces of the reply text.
+    """
+    # The stream is read on its own thread so the socket keeps draining
+    # while the reply re-renders
+    events: queue.Queue = queue.Queue()
+    reader = threading.Thread(
+        target=drain_events,
+        args=(stream_chat(session_id, prompt), events),
+        daemon=True,
+    )
+    add_script_run_ctx(reader)
+    reader.start()
+
+    pending = ""
+    last_flush = time.monotonic()
+    tool_calls: dict[str, str] = {}  # tool_use id -> tool name
+
+    while reader.is_alive() or not events.empty():
+        try:
+            event_type, data = events.get(timeout=RENDER_INTERVAL)
+        except queue.Empty:
+            # Nothing new arrived; show whatever text is still held back
+            if pending:
+                yield pending
+                pending = ""
+                last_flush = time.monotonic()
+            continue
+
+        if event_type == "text":
+            content = data.get("content", "")
+            pending += content
+            now = time.monotonic()
+            if "\n" in content or now - last_flush >= RENDER_INTERVAL:
+                yield pending
+                pending = ""
+                last_flush = now
+
+        elif event_type == "tool_use":
+            tool_id = data.get("id", "")
+            # Each tool call is rendered once
+            if tool_id in tool_calls:
+                continue
+            tool_name = data.get("name", "Unknown")
+            tool_calls[tool_id] = tool_name
+
+            with tool_container:
+                with st.expander(f"🔧 Using tool: {tool_name}", expanded=False):
+                    st.code(format_json(data.get("input", {})), language="json")
+
+        elif event_type == "tool_result":
+            tool_name = tool_calls.get(data.get("tool_use_id", ""))
+            if tool_name is not None:
+                with tool_container:
+                    with st.expander(
+                        f"📊 Result from: {tool_name}",
+                        expanded=False,
+                    ):
+                        st.code(format_json(data.get("result", {})), language="json")
+
+        elif event_type == "error":
+            with tool_container:
+                st.error(f"Error: {data.get('error', 'Unknown error')}")
+
+    if pending:
+        yield pending
 
 
 def main():
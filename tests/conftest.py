@@ -0,0 +1,37 @@
+"""Shared test fixtures."""
+
+import pytest
+from moto import mock_aws
+
+import app.db.dynamodb as db_module
+from app.config import settings
+from app.db import (
+    create_messages_table,
+    create_sessions_table,
+    get_dynamodb_client,
+    get_dynamodb_resource,
+    get_messages_table,
+    get_table,
+)
+
+_DYNAMODB_SINGLETONS = (get_dynamodb_client, get_dynamodb_resource, get_table, get_messages_table)
+
+
+def _reset_dynamodb() -> None:
+    """Drop cached DynamoDB clients and tables so they bind to the mock."""
+    for singleton in _DYNAMODB_SINGLETONS:
+        singleton.cache_clear()
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    """Mocked DynamoDB with the sessions and messages tables created."""
+    # moto intercepts the default AWS endpoint, not the local one
+    monkeypatch.setattr(settings, "dynamodb_endpoint_url", None)
+    monkeypatch.setattr(db_module, "_updated_at_index_ready", False)
+    with mock_aws():
+        _reset_dynamodb()
+        assert create_sessions_table()
+        assert create_messages_table()
+        yield
+    _reset_dynamodb()
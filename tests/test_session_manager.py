@@ -0,0 +1,98 @@
+"""Tests for the DynamoDB session manager."""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import app.db.dynamodb as db_module
+from app.config import settings
+from app.db import create_sessions_table, get_dynamodb_client, get_table, updated_at_index_ready
+from app.session import Message, SessionManager, ToolCall
+
+
+def test_add_messages_stores_float_tool_results(dynamodb):
+    manager = SessionManager()
+    session = manager.create_session()
+    sent_at = datetime.now(UTC)
+    messages = [
+        Message(role="user", content="서울 날씨 알려줘", timestamp=sent_at),
+        Message(
+            role="assistant",
+            content="서울은 21.5도로 맑습니다.",
+            timestamp=sent_at + timedelta(seconds=1),
+            tool_calls=[
+                ToolCall(
+                    id="toolu_1",
+                    name="get_weather",
+                    input={"city": "Seoul"},
+                    result={"temperature": 21.5, "forecast": [{"pop": 0.2}]},
+                )
+            ],
+        ),
+    ]
+
+    assert manager.add_messages(session.id, messages)
+
+    stored = manager.get_session(session.id)
+    assert stored is not None
+    assert stored.message_count == 2
+    assert [m.role for m in stored.messages] == ["user", "assistant"]
+    assert stored.messages[1].tool_calls[0].result == {
+        "temperature": Decimal("21.5"),
+        "forecast": [{"pop": Decimal("0.2")}],
+    }
+
+
+def test_list_sessions_includes_sessions_written_before_the_index(dynamodb, monkeypatch):
+    # Recreate the sessions table as it was before the updated_at index
+    client = get_dynamodb_client()
+    client.delete_table(TableName=settings.dynamodb_table_name)
+    client.create_table(
+        TableName=settings.dynamodb_table_name,
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    get_table().put_item(
+        Item={
+            "id": "legacy",
+            "title": "예전 세션",
+            "created_at": "2025-01-01T00:00:00",
+            "updated_at": "2025-01-01T00:00:00",
+            "messages": [
+                {"role": "user", "content": "안녕", "timestamp": "2025-01-01T00:00:00"},
+            ],
+            "total_tokens": 0,
+        }
+    )
+    monkeypatch.setattr(db_module, "_updated_at_index_ready", False)
+
+    assert create_sessions_table()
+    assert updated_at_index_ready()
+    manager = SessionManager()
+    manager.create_session(title="New Session")
+
+    sessions = manager.list_sessions()
+    assert [s.title for s in sessions] == ["New Session", "예전 세션"]
+    assert sessions[1].message_count == 1
+
+
+def test_backfill_state_is_read_from_the_table(dynamodb, monkeypatch):
+    # Another process that never ran the startup backfill
+    monkeypatch.setattr(db_module, "_updated_at_index_ready", False)
+    assert updated_at_index_ready()
+
+    # A backfilled table is not scanned again on startup
+    def fail_scan(**kwargs):
+        raise AssertionError("sessions table scanned")
+
+    monkeypatch.setattr(get_table(), "scan", fail_scan)
+    assert create_sessions_table()
+
+
+def test_list_sessions_scans_until_the_index_is_ready(dynamodb, monkeypatch):
+    manager = SessionManager()
+    created = [manager.create_session(title=f"Session {i}") for i in range(3)]
+    monkeypatch.setattr("app.session.manager.updated_at_index_ready", lambda: False)
+
+    sessions = manager.list_sessions(limit=2)
+    assert [s.id for s in sessions] == [created[2].id, created[1].id]